@@ -1,11 +1,63 @@
-import beaupy.spinners as spinners  # noqa
-from beaupy._beaupy import (  # noqa
-    Config,
-    DefaultKeys,
-    confirm,
-    console,
-    prompt,
-    select,
-    select_multiple,
-)
-from beaupy._internals import Abort, ConversionError, ValidationError  # noqa
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    import beaupy.aio as aio  # noqa
+    import beaupy.spinners as spinners  # noqa
+    from beaupy._beaupy import (  # noqa
+        Config,
+        DefaultKeys,
+        confirm,
+        console,
+        prompt,
+        select,
+        select_multiple,
+        select_tree,
+    )
+    from beaupy._headless import HeadlessFrame, HeadlessSession  # noqa
+    from beaupy._internals import (  # noqa
+        Abort,
+        Column,
+        ConversionError,
+        OptionFeed,
+        RenderStats,
+        ValidationError,
+    )
+
+# Public names are resolved on first access, so importing beaupy does not load rich, questo and emoji
+# until an element is actually used
+_LAZY_ATTRIBUTES = {
+    'spinners': 'beaupy.spinners',
+    'aio': 'beaupy.aio',
+    'Config': 'beaupy._beaupy',
+    'DefaultKeys': 'beaupy._beaupy',
+    'confirm': 'beaupy._beaupy',
+    'console': 'beaupy._beaupy',
+    'prompt': 'beaupy._beaupy',
+    'select': 'beaupy._beaupy',
+    'select_multiple': 'beaupy._beaupy',
+    'select_tree': 'beaupy._beaupy',
+    'Abort': 'beaupy._internals',
+    'Column': 'beaupy._internals',
+    'ConversionError': 'beaupy._internals',
+    'ValidationError': 'beaupy._internals',
+    'RenderStats': 'beaupy._internals',
+    'OptionFeed': 'beaupy._internals',
+    'HeadlessSession': 'beaupy._headless',
+    'HeadlessFrame': 'beaupy._headless',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = import_module(_LAZY_ATTRIBUTES[name])
+    value = module if name in ('spinners', 'aio') else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -7,33 +7,101 @@ __license__ = 'MIT'
 
 import math
 import warnings
+from collections import deque
+from collections.abc import Sequence
+from contextlib import nullcontext
 from functools import partial
-from typing import Any, Callable, List, Optional, Tuple, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
-from questo import prompt as qprompt
-from questo import select as qselect
 from rich.console import Console
-from rich.live import Live
+from rich.live import Live  # noqa: F401
 from yakh import get_key
 from yakh.key import Key, Keys
 
 from beaupy._internals import (
+    _PASTE_END,
+    _PASTE_START,
     Abort,
+    Column,
     ConversionError,
+    OptionFeed,
+    RenderStats,
     TargetType,
     ValidationError,
+    _bracketed_paste,
+    _coalesce_keys,
+    _CompletionProvider,
     _cursor_hidden,
+    _display_width,
+    _feed_redraws,
+    _FilteredOptions,
+    _FuzzyMatcher,
+    _GridLayout,
+    _handle_prompt_key,
+    _index_preprocessor,
+    _input_pending,
+    _is_printable,
+    _Keymap,
+    _LazyOptions,
+    _live_display,
     _paginate_back,
     _paginate_forward,
-    _prompt_key_handler,
+    _prefetch_options,
+    _Prompt,
+    _PromptState,
     _render_prompt,
     _render_select,
+    _render_select_grid,
     _render_select_multiple,
-    _update_rendered,
+    _render_select_table,
+    _render_select_tree,
+    _render_stats,
+    _RenderScheduler,
+    _scroll_viewport,
+    _Select,
+    _SelectState,
+    _source_index,
+    _Table,
+    _TreeNode,
+    _TreeView,
+    _TypeAhead,
     _validate_prompt_value,
 )
 
-console = Console(stderr=True)
+# Created on first use by _get_console, so importing beaupy does not touch the terminal
+console: Console
+
+# Lines kept free below the options in viewport mode for the footer and error messages
+_VIEWPORT_RESERVED_LINES = 3
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'console':
+        return _get_console()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _get_console() -> Console:
+    global console
+    try:
+        return console
+    except NameError:
+        console = Console(stderr=True)
+        return console
 
 
 class DefaultKeys:
@@ -80,99 +148,249 @@ class Config:
         they will return some sane alternative to their usual return. For `select`, `prompt` and `confirm` this means `None`, while for
         `select_multiple` it means an empty list - `[]`.  Defaults to False.
         transient(bool): If False, elements will remain displayed after their context has ended. Defaults to True.
+        max_fps(Optional[float]): Maximal number of frames a second elements draw. State changes in between are coalesced,
+        the latest one is always drawn. If None, every change is drawn immediately. Defaults to None.
+        diff_rendering(bool): If True, elements rewrite only the lines that changed since the previous frame instead of
+        repainting all of them, which reduces the output sent over slow connections. Defaults to False.
+        completion_debounce(float): Number of seconds `prompt` waits after the last keypress before computing completions
+        in the background. Defaults to 0.1.
+        preprocessor_cache_size(Optional[int]): Maximal number of preprocessed options `select` and `select_multiple` keep cached,
+        least recently used options are evicted first. If None, the cache is unbounded. Defaults to None.
+        options_chunk_size(int): Number of options `select` and `select_multiple` fetch at once from lazy option sources,
+        such as iterators and generators. Defaults to 100.
+        feed_refresh_interval(float): Minimal number of seconds between redraws of `select` and `select_multiple` caused by
+        options arriving to an OptionFeed. Defaults to 0.1.
+        render_stats(Optional[Callable[[RenderStats], Any]]): If set, called with the RenderStats of every element once it
+        closes: frames painted, time spent rendering and writing, bytes written and key-to-paint latencies. Defaults to None.
+        type_ahead_timeout(float): Number of seconds after which the next character typed into a `select` or `select_multiple`
+        with `type_ahead` starts a new prefix instead of extending the previous one. Defaults to 1.0.
     """
 
     raise_on_interrupt: bool = False
     raise_on_escape: bool = False
     transient: bool = True
+    max_fps: Optional[float] = None
+    diff_rendering: bool = False
+    completion_debounce: float = 0.1
+    preprocessor_cache_size: Optional[int] = None
+    options_chunk_size: int = 100
+    feed_refresh_interval: float = 0.1
+    render_stats: Optional[Callable[[RenderStats], Any]] = None
+    type_ahead_timeout: float = 1.0
 
 
-_navigation_keys = [DefaultKeys.up, DefaultKeys.down, DefaultKeys.right, DefaultKeys.left, DefaultKeys.home, DefaultKeys.end]
+_NAVIGATION_ACTIONS = frozenset(('up', 'down', 'right', 'left', 'home', 'end'))
 
 
-def _navigate_select(
-    state: qselect.SelectState,
-    keypress: Key,
-) -> qselect.SelectState:
+def _keymap() -> _Keymap:
+    """Compiles DefaultKeys as they are now, elements do so once when they are displayed"""
+    return _Keymap({name: keys for name, keys in vars(DefaultKeys).items() if not name.startswith('_')})
 
-    total_options = len(state.options)
+
+def _navigate_select(
+    state: _SelectState,
+    actions: FrozenSet[str],
+) -> _SelectState:
 
     page: int = state.index // state.page_size + 1
+    wraps_to_end = (
+        (state.index < state.columns and 'up' in actions)
+        or (page == 1 and state.pagination and 'left' in actions)  # noqa: W503
+        or (state.index == 0 and state.columns > 1 and 'left' in actions)  # noqa: W503
+    )
+    _prefetch_options(state, load_all=wraps_to_end or 'end' in actions)
+
+    total_options = len(state.options)
     total_pages = math.ceil(len(state.options) / state.page_size)
 
     show_from = (page - 1) * state.page_size
     show_to = min(show_from + state.page_size, len(state.options))
 
     index = state.index
+    columns = state.columns
 
-    if keypress in DefaultKeys.up:
+    if 'up' in actions:
         if index <= show_from and state.pagination:
             page = _paginate_back(page, total_pages)
-        index -= 1
-        index = index % total_options
-    elif keypress in DefaultKeys.down:
+        # Leaving the first row wraps around to the last option in the same column
+        index = index - columns if index >= columns else index + (total_options - 1 - index) // columns * columns
+    elif 'down' in actions:
         if index > show_to - 2 and state.pagination:
             page = _paginate_forward(page, total_pages)
-        index += 1
-        index = index % total_options
-    elif keypress in DefaultKeys.right and state.pagination:
+        index = index + columns if index + columns < total_options else index % columns
+    elif 'right' in actions and columns > 1:
+        index = (index + 1) % total_options
+    elif 'left' in actions and columns > 1:
+        index = (index - 1) % total_options
+    elif 'right' in actions and state.pagination:
         page = _paginate_forward(page, total_pages)
         index = (page - 1) * state.page_size
-    elif keypress in DefaultKeys.left and state.pagination:
+    elif 'left' in actions and state.pagination:
         page = _paginate_back(page, total_pages)
         index = (page - 1) * state.page_size
-    elif keypress in DefaultKeys.home:
+    elif 'home' in actions:
         page = 1
         index = 0
-    elif keypress in DefaultKeys.end:
+    elif 'end' in actions:
         page = total_pages
         index = total_options - 1
 
     state.index = index
+    _scroll_viewport(state)
+    _prefetch_options(state)
+    return state
+
+
+def _filter_select(
+    state: _SelectState, keypress: Key, actions: FrozenSet[str], matcher: _FuzzyMatcher, options: Sequence, table: Optional[_Table]
+) -> _SelectState:
+    query = state.filter[:-1] if 'backspace' in actions else state.filter + str(keypress)
+    if query and isinstance(options, _LazyOptions):
+        options.load_all()
+
+    state.filter = query
+    matches = matcher.match(query) if query else None
+    indexes = table.order(matches) if table is not None else matches
+    state.options = _FilteredOptions(options, indexes) if indexes is not None else options
+    state.index = 0
+    state.viewport_offset = 0
+    return state
+
+
+def _reorder_select(state: _SelectState, options: Sequence, indexes: Optional[List[int]]) -> _SelectState:
+    current = _source_index(state.options, state.index) if state.options else None
+    state.options = _FilteredOptions(options, indexes) if indexes is not None else options
+    if current is not None:
+        # The cursor stays on the row it was on
+        state.index = (state.options.position(current) or 0) if isinstance(state.options, _FilteredOptions) else current
+    _scroll_viewport(state)
+    return state
+
+
+def _sort_select(state: _SelectState, table: _Table, options: Sequence, matches: Optional[List[int]] = None) -> _SelectState:
+    if isinstance(options, _LazyOptions):
+        options.load_all()
+    table.cycle_sort()
+    return _reorder_select(state, options, table.order(matches))
+
+
+def _refresh_select(state: _SelectState, options: Sequence, matcher: Optional[_FuzzyMatcher], table: Optional[_Table]) -> _SelectState:
+    """Takes options which arrived to a feed into the filtered or sorted view of the options, others show them as they are"""
+    if not isinstance(state.options, _FilteredOptions):
+        return state
+    matches = matcher.match(state.filter) if matcher is not None and state.filter else None
+    return _reorder_select(state, options, table.order(matches) if table is not None else matches)
+
+
+def _jump_select(state: _SelectState, keypress: Key, type_ahead: _TypeAhead, options: Sequence) -> _SelectState:
+    if isinstance(options, _LazyOptions):
+        options.load_all()
+    index = type_ahead.jump(str(keypress))
+    if index is not None and isinstance(state.options, _FilteredOptions):
+        index = state.options.position(index)
+    if index is not None:
+        state.index = index
+        _scroll_viewport(state)
+        _prefetch_options(state)
     return state
 
 
 def _navigate_select_multiple(
-    state: qselect.SelectState, keypress: Key, minimal_count: int, maximal_count: Union[int, None]
-) -> qselect.SelectState:
-    if keypress in DefaultKeys.interrupt:
-        state.selected_indexes = []
+    state: _SelectState, keypress: Key, actions: FrozenSet[str], minimal_count: int, maximal_count: Union[int, None]
+) -> _SelectState:
+    if 'interrupt' in actions:
+        state.selected_indexes = {}
         if Config.raise_on_interrupt:
             raise KeyboardInterrupt()
         state.abort = True
 
-    elif any([keypress in navigation_keys for navigation_keys in _navigation_keys]):
-        state = _navigate_select(state, keypress=keypress)
-    elif keypress in DefaultKeys.select_all:
+    elif actions & _NAVIGATION_ACTIONS:
+        if state.options:
+            state = _navigate_select(state, actions)
+    elif 'select_all' in actions:
+        _prefetch_options(state, load_all=True)
         if len(state.selected_indexes) == (maximal_count if maximal_count is not None else len(state.options)):
-            state.selected_indexes = []
+            state.selected_indexes = {}
         else:
             if maximal_count is not None:
-                state.selected_indexes = list(range(maximal_count))
+                state.selected_indexes = dict.fromkeys(range(maximal_count))
                 state.error = f'Must select at most {maximal_count} options'
             else:
-                state.selected_indexes = list(range(len(state.options)))
-    elif keypress in DefaultKeys.select:
-        if state.index in state.selected_indexes:
-            state.selected_indexes.remove(state.index)
+                state.selected_indexes = dict.fromkeys(range(len(state.options)))
+    elif 'select' in actions and state.options:
+        index = _source_index(state.options, state.index)
+        if index in state.selected_indexes:
+            del state.selected_indexes[index]
         else:
             if maximal_count is not None and len(state.selected_indexes) + 1 > maximal_count:
                 state.error = f'Must select at most {maximal_count} options'
             else:
-                state.selected_indexes.append(state.index)
-    elif keypress in DefaultKeys.confirm:
+                state.selected_indexes[index] = None
+    elif 'confirm' in actions:
         if minimal_count > len(state.selected_indexes):
             state.error = f'Must select at least {minimal_count} options'
         else:
             state.exit = True
-    elif keypress in DefaultKeys.escape:
-        state.selected_indexes = []
+    elif 'escape' in actions:
+        state.selected_indexes = {}
         if Config.raise_on_escape:
             raise Abort(keypress)
         state.exit = True
     return state
 
 
+# Keys read from the terminal but not handed to an element yet, they are read before the terminal is read again
+_unread_keys: Deque[Key] = deque()
+
+
+def _next_key() -> Key:
+    return _unread_keys.popleft() if _unread_keys else get_key()
+
+
+def _is_text(key: Key) -> bool:
+    # yakh reports enter as printable, it ends a batch of keys nonetheless
+    return _is_printable(key) and str(key).isprintable()
+
+
+def _read_keys() -> List[Key]:
+    """Blocks until a key is pressed, then also reads the text already waiting, e.g. the rest of a paste.
+
+    Outside of a paste, reading stops after the first key which is not text, such as enter, so that keys typed after it
+    are left for whichever element reads next.
+    """
+    keys = [_next_key()]
+    in_paste = keys[0] == _PASTE_START
+    while in_paste or (_is_text(keys[-1]) and (_unread_keys or _input_pending())):
+        keys.append(_next_key())
+        if keys[-1] == _PASTE_START or keys[-1] == _PASTE_END:
+            in_paste = keys[-1] == _PASTE_START
+    return _coalesce_keys(keys)
+
+
+def _read_key() -> Key:
+    return _next_key()
+
+
+Input = TypeVar('Input')
+Result = TypeVar('Result')
+
+
+def _drive(flow: Generator[None, Input, Result], read: Callable[[], Input]) -> Result:
+    """Runs an element to completion, answering each of its requests for input with `read()`
+
+    Elements are generators yielding whenever they wait for keys, so that `beaupy.aio` can drive the same ones with
+    awaited reads. Closing the generator when reading fails leaves its contexts, restoring the terminal.
+    """
+    try:
+        next(flow)
+        while True:
+            flow.send(read())
+    except StopIteration as finished:
+        return cast(Result, finished.value)
+    finally:
+        flow.close()
+
+
 def prompt(
     prompt: str,
     target_type: Type[TargetType] = str,
@@ -195,6 +413,9 @@ def prompt(
         raise_type_conversion_fail (bool, optional): If True, invalid inputs will raise `rich.internals.ConversionError`, else
                                                      the error will be reported onto the console. Defaults to True.
         initial_value (str, optional): If present, the value is placed in the prompt as the default value.
+        completion (Callable[[str], List[str]], optional): Function returning completions of the typed value, offered
+                                                           by pressing tab. It is called on a background thread once
+                                                           typing pauses for `Config.completion_debounce` seconds.
 
     Raises:
         ValidationError: Raised if validation with provided validator fails
@@ -204,11 +425,37 @@ def prompt(
     Returns:
         Union[T, str]: Returns a value formatted as provided type or string if no type is provided
     """
+    return _drive(
+        _prompt(
+            prompt=prompt,
+            target_type=target_type,
+            validator=validator,
+            secure=secure,
+            raise_validation_fail=raise_validation_fail,
+            raise_type_conversion_fail=raise_type_conversion_fail,
+            initial_value=initial_value,
+            completion=completion,
+        ),
+        _read_keys,
+    )
+
+
+def _prompt(
+    prompt: str,
+    target_type: Type[TargetType],
+    validator: Callable[[TargetType], bool],
+    secure: bool,
+    raise_validation_fail: bool,
+    raise_type_conversion_fail: bool,
+    initial_value: Optional[str],
+    completion: Optional[Callable[[str], List[str]]],
+) -> Generator[None, List[Key], TargetType]:
+    console = _get_console()
 
     renderer = partial(_render_prompt, secure)
 
-    element = qprompt.Prompt(
-        state=qprompt.PromptState(
+    element = _Prompt(
+        state=_PromptState(
             title=prompt,
             value=(initial_value or ''),
             cursor_position=len(initial_value or ''),
@@ -216,40 +463,51 @@ def prompt(
         renderer=renderer,
         transient=Config.transient,
         console=console,
+        max_fps=Config.max_fps,
+        diff_rendering=Config.diff_rendering,
+        name='prompt',
+        stats_callback=Config.render_stats,
     )
 
-    with element.displayed():
+    completions = _CompletionProvider(completion, Config.completion_debounce) if completion else None
+
+    with element.displayed(), completions or nullcontext(), _bracketed_paste(console):
         while True:
-            key = get_key()
             new_state = element.state
-            new_state.completion.options = completion(new_state.value) if completion else []
-            new_state = _prompt_key_handler(new_state, key)
-            if new_state.exit:
-                if key == Keys.ESC:
-                    if Config.raise_on_escape:
-                        raise Abort(key)
+            keys = yield
+            element.key_read(len(keys))
+            for key in keys:
+                if completions and key == Keys.TAB and not (new_state.completion.in_completion_ctx and new_state.completion.options):
+                    new_state.completion.options = completions.get(new_state.value)
+                _handle_prompt_key(new_state, key)
+                if new_state.exit:
+                    if key == Keys.ESC:
+                        if Config.raise_on_escape:
+                            raise Abort(key)
+                        return None
+                    try:
+                        res = _validate_prompt_value(
+                            value=[*(new_state.value or '')],
+                            target_type=target_type,
+                            validator=validator,
+                            secure=secure,
+                        )
+                        return res
+                    except ValidationError as e:
+                        if raise_validation_fail:
+                            raise e
+
+                        new_state.error = str(e)
+                    except ConversionError as e:
+                        if raise_type_conversion_fail:
+                            raise e
+                        new_state.error = str(e)
+                elif new_state.abort:
+                    if Config.raise_on_interrupt:
+                        raise KeyboardInterrupt()
                     return None
-                try:
-                    res = _validate_prompt_value(
-                        value=[*(new_state.value or '')],
-                        target_type=target_type,
-                        validator=validator,
-                        secure=secure,
-                    )
-                    return res
-                except ValidationError as e:
-                    if raise_validation_fail:
-                        raise e
-
-                    new_state.error = str(e)
-                except ConversionError as e:
-                    if raise_type_conversion_fail:
-                        raise e
-                    new_state.error = str(e)
-            elif new_state.abort:
-                if Config.raise_on_interrupt:
-                    raise KeyboardInterrupt()
-                return None
+            if completions and not new_state.completion.in_completion_ctx and new_state.value is not None:
+                completions.request(new_state.value)
             element.state = new_state
 
 
@@ -257,7 +515,7 @@ T = TypeVar('T')
 
 
 def select(
-    options: List[Union[str, T]],
+    options: Union[List[Union[str, T]], Iterable[Union[str, T]]],
     preprocessor: Callable[[T], str] = lambda val: str(val),
     cursor: str = '>',
     cursor_style: str = 'pink1',
@@ -266,13 +524,22 @@ def select(
     strict: bool = False,
     pagination: bool = False,
     page_size: int = 5,
+    cache_preprocessed: bool = True,
+    filterable: bool = False,
+    type_ahead: bool = False,
+    grid: bool = False,
+    columns: Optional[List[Column]] = None,
 ) -> Union[int, Any, None]:
     """A prompt that allows selecting one option from a list of options
 
     Args:
-        options (List[Union[str, T]]): A list of options to select from. If `preprocessor` is left as default (not passed),
-                                       it needs to be a list of strings or objects with a `__str__` method. Otherwise,
-                                       you can pass a `preprocessor` to create a string representation of arbitrary data-structures.
+        options (Union[List[Union[str, T]], Iterable[Union[str, T]]]): A list of options to select from. If `preprocessor` is left
+                                       as default (not passed), it needs to be a list of strings or objects with a `__str__` method.
+                                       Otherwise, you can pass a `preprocessor` to create a string representation of arbitrary
+                                       data-structures. Iterators, generators and objects implementing `__getitem__` (and optionally
+                                       `__len__`) are read lazily, in chunks of `Config.options_chunk_size`, as the cursor approaches
+                                       options that are not loaded yet. Options of an `OptionFeed` can keep arriving while
+                                       the element is displayed.
         preprocessor (Callable[[T], str]): A callable that can be used to preprocess the list of options prior to printing.
                                            For example, if you passed a `Person` object with `name` attribute, preprocessor
                                            could be `lambda person: person.name` to just show the content of `name` attribute
@@ -283,18 +550,83 @@ def select(
         return_index (bool, optional): If `True`, `select` will return the index of selected element in options. Defaults to `False`.
         strict (bool, optional): If empty `options` is provided and strict is `False`, None will be returned,
         if it's `True`, `ValueError` will be thrown. Defaults to False.
-        pagination (bool, optional): If `True`, pagination will be used. Defaults to False.
+        pagination (bool, optional): If `True`, pagination will be used. Otherwise only the options fitting into the terminal
+                                     height are rendered and the view scrolls along with the cursor. Defaults to False.
         page_size (int, optional): Number of options to show on a single page if pagination is enabled. Defaults to 5.
+        cache_preprocessed (bool, optional): If `True`, `preprocessor` is called only once per option and its output is reused
+                                             on every redraw. Pass `False` for preprocessors whose output changes over time.
+                                             Defaults to True.
+        filterable (bool, optional): If `True`, typing narrows the options down to the ones containing the typed characters
+                                     in order, ignoring case. Defaults to False.
+        type_ahead (bool, optional): If `True`, typing moves the cursor to the first option, in alphabetical order, starting with
+                                     the typed characters, ignoring case. Characters typed within `Config.type_ahead_timeout`
+                                     of each other form one prefix. Has no effect if `filterable` is `True`. Defaults to False.
+        grid (bool, optional): If `True`, options are laid out row by row in as many columns as fit the terminal width, arrow
+                               keys move the cursor in all four directions. Cannot be combined with `pagination`.
+                               Defaults to False.
+        columns (Optional[List[Column]], optional): If given, options are rows shown in a table with these columns instead of
+                                                    being preprocessed, `preprocessor` and `cache_preprocessed` are ignored.
+                                                    Cells are formatted once per row, `tab` cycles sorting by each column,
+                                                    ascending and descending, and back to the original order. Cannot be
+                                                    combined with `grid`. Defaults to None.
 
     Raises:
-        ValueError: Thrown if no `options` are provided and strict is `True`
+        ValueError: Thrown if no `options` are provided and strict is `True`, or if `grid` is combined with `pagination` or
+                    `columns`
         KeyboardInterrupt: Raised when keyboard interrupt is encountered and Config.raise_on_interrupt is True
 
     Returns:
         Union[int, str, None]: Selected value or the index of a selected option or `None`
     """
+    return _drive(
+        _select(
+            options=options,
+            preprocessor=preprocessor,
+            cursor=cursor,
+            cursor_style=cursor_style,
+            cursor_index=cursor_index,
+            return_index=return_index,
+            strict=strict,
+            pagination=pagination,
+            page_size=page_size,
+            cache_preprocessed=cache_preprocessed,
+            filterable=filterable,
+            type_ahead=type_ahead,
+            grid=grid,
+            columns=columns,
+        ),
+        _read_key,
+    )
+
 
-    if not options:
+def _select(
+    options: Union[List[Union[str, T]], Iterable[Union[str, T]]],
+    preprocessor: Callable[[T], str],
+    cursor: str,
+    cursor_style: str,
+    cursor_index: int,
+    return_index: bool,
+    strict: bool,
+    pagination: bool,
+    page_size: int,
+    cache_preprocessed: bool,
+    filterable: bool,
+    type_ahead: bool,
+    grid: bool,
+    columns: Optional[List[Column]],
+) -> Generator[None, Key, Union[int, Any, None]]:
+    console = _get_console()
+
+    if grid and pagination:
+        raise ValueError('`grid` and `pagination` cannot be combined')
+    if grid and columns:
+        raise ValueError('`grid` and `columns` cannot be combined')
+
+    if not isinstance(options, Sequence):
+        lazy_options = _LazyOptions(options, Config.options_chunk_size)
+        lazy_options.load_until(cursor_index + max(page_size, console.height))
+        options = lazy_options
+    if not options and not isinstance(options, OptionFeed):
         if strict:
             raise ValueError('`options` cannot be empty')
         return None
@@ -302,44 +634,76 @@ def select(
         warnings.warn('`cursor_style` should be a valid style, defaulting to `white`')
         cursor_style = 'white'
 
-    renderer = partial(_render_select, preprocessor, cursor_style, cursor)
+    table = _Table(options, columns, _display_width(cursor) + 1) if columns else None
+    indexed_preprocessor = table or _index_preprocessor(preprocessor, cache_preprocessed, Config.preprocessor_cache_size)
+    renderer = partial(_render_select, indexed_preprocessor, cursor_style, cursor)
+    if grid:
+        renderer = partial(_render_select_grid, _GridLayout(options, indexed_preprocessor, console, cursor), renderer)
+    if table is not None:
+        renderer = partial(_render_select_table, table, renderer)
+    matcher = _FuzzyMatcher(options, indexed_preprocessor)
+    typed_prefix = _TypeAhead(options, indexed_preprocessor, Config.type_ahead_timeout)
+
+    state = _SelectState(
+        options=options,
+        title='',
+        index=cursor_index,
+        pagination=pagination,
+        page_size=page_size,
+        viewport_size=None if pagination else max(1, console.height - _VIEWPORT_RESERVED_LINES - (table is not None)),
+    )
+    _scroll_viewport(state)
 
-    element = qselect.Select(
-        qselect.SelectState(
-            options=options,
-            title='',
-            index=cursor_index,
-            pagination=pagination,
-            page_size=page_size,
-        ),
+    element = _Select(
+        state,
         renderer=renderer,
         transient=Config.transient,
         console=console,
+        max_fps=Config.max_fps,
+        diff_rendering=Config.diff_rendering,
+        name='select',
+        stats_callback=Config.render_stats,
     )
+    keymap = _keymap()
 
-    with element.displayed():
+    refresh = partial(element.replace_state, partial(_refresh_select, options=options, matcher=matcher, table=table))
+    with element.displayed(), _feed_redraws(options, refresh, Config.feed_refresh_interval):
 
         while True:
-            keypress = get_key()
-
-            if any([keypress in navigation_keys for navigation_keys in _navigation_keys]):
-                element.state = _navigate_select(element.state, keypress=keypress)
-            elif keypress in DefaultKeys.confirm:
-                if return_index:
-                    return element.state.index
-                return options[element.state.index]
-            elif keypress in DefaultKeys.escape:
-                if Config.raise_on_escape:
-                    raise Abort(keypress)
-                return None
-            elif keypress in DefaultKeys.interrupt:
-                if Config.raise_on_interrupt:
-                    raise KeyboardInterrupt()
-                return None
+            keypress = yield
+            with element.handling_key():
+                actions = keymap.actions(keypress)
+
+                if actions & _NAVIGATION_ACTIONS:
+                    typed_prefix.reset()
+                    if element.state.options:
+                        element.state = _navigate_select(element.state, actions)
+                elif 'confirm' in actions:
+                    if not element.state.options:
+                        continue
+                    index = _source_index(element.state.options, element.state.index)
+                    if return_index:
+                        return index
+                    return options[index]
+                elif 'escape' in actions:
+                    if Config.raise_on_escape:
+                        raise Abort(keypress)
+                    return None
+                elif 'interrupt' in actions:
+                    if Config.raise_on_interrupt:
+                        raise KeyboardInterrupt()
+                    return None
+                elif 'tab' in actions and table is not None:
+                    matches = matcher.match(element.state.filter) if element.state.filter else None
+                    element.state = _sort_select(element.state, table, options, matches)
+                elif filterable and ('backspace' in actions or _is_printable(keypress)):
+                    element.state = _filter_select(element.state, keypress, actions, matcher, options, table)
+                elif type_ahead and _is_printable(keypress):
+                    element.state = _jump_select(element.state, keypress, typed_prefix, options)
 
 
 def select_multiple(
-    options: List[Union[str, T]],
+    options: Union[List[Union[str, T]], Iterable[Union[str, T]]],
     preprocessor: Callable[[T], str] = lambda val: str(val),
     tick_character: str = '✓',
     tick_style: str = 'pink1',
@@ -352,13 +716,20 @@ def select_multiple(
     strict: bool = False,
     pagination: bool = False,
     page_size: int = 5,
+    cache_preprocessed: bool = True,
+    type_ahead: bool = False,
+    columns: Optional[List[Column]] = None,
 ) -> List[Union[int, Any]]:
     """A prompt that allows selecting multiple options from a list of options
 
     Args:
-        options (List[Union[str, T]]): A list of options to select from. If `preprocessor` is left as default (not passed),
-                                       it needs to be a list of strings or objects with a `__str__` method. Otherwise,
-                                       you can pass a `preprocessor` to create a string representation of arbitrary data-structures.
+        options (Union[List[Union[str, T]], Iterable[Union[str, T]]]): A list of options to select from. If `preprocessor` is left
+                                       as default (not passed), it needs to be a list of strings or objects with a `__str__` method.
+                                       Otherwise, you can pass a `preprocessor` to create a string representation of arbitrary
+                                       data-structures. Iterators, generators and objects implementing `__getitem__` (and optionally
+                                       `__len__`) are read lazily, in chunks of `Config.options_chunk_size`, as the cursor approaches
+                                       options that are not loaded yet. Options of an `OptionFeed` can keep arriving while
+                                       the element is displayed.
         preprocessor (Callable[[T], str]): A callable that can be used to preprocess the list of options prior to printing.
                                            For example, if you passed a `Person` object with `name` attribute, preprocessor
                                            could be `lambda person: person.name` to just show the content of `name` attribute
@@ -374,8 +745,20 @@ def select_multiple(
                                          of ticked elements in options. Defaults to `False`.
         strict (bool, optional): If empty `options` is provided and strict is `False`, None will be returned,
                                  if it's `True`, `ValueError` will be thrown. Defaults to False.
-        pagination (bool, optional): If `True`, pagination will be used. Defaults to False.
+        pagination (bool, optional): If `True`, pagination will be used. Otherwise only the options fitting into the terminal
+                                     height are rendered and the view scrolls along with the cursor. Defaults to False.
         page_size (int, optional): Number of options to show on a single page if pagination is enabled. Defaults to 5.
+        cache_preprocessed (bool, optional): If `True`, `preprocessor` is called only once per option and its output is reused
+                                             on every redraw. Pass `False` for preprocessors whose output changes over time.
+                                             Defaults to True.
+        type_ahead (bool, optional): If `True`, typing moves the cursor to the first option, in alphabetical order, starting with
+                                     the typed characters, ignoring case. Characters typed within `Config.type_ahead_timeout`
+                                     of each other form one prefix. Keys bound in `DefaultKeys`, such as `select_all`, keep
+                                     their meaning. Defaults to False.
+        columns (Optional[List[Column]], optional): If given, options are rows shown in a table with these columns instead of
+                                                    being preprocessed, `preprocessor` and `cache_preprocessed` are ignored.
+                                                    Cells are formatted once per row, `tab` cycles sorting by each column,
+                                                    ascending and descending, and back to the original order. Defaults to None.
 
     Raises:
         KeyboardInterrupt: Raised when keyboard interrupt is encountered and Config.raise_on_interrupt is True
@@ -383,8 +766,55 @@ def select_multiple(
     Returns:
         Union[List[str], List[int]]: A list of selected values or indices of selected options
     """
+    return _drive(
+        _select_multiple(
+            options=options,
+            preprocessor=preprocessor,
+            tick_character=tick_character,
+            tick_style=tick_style,
+            cursor_style=cursor_style,
+            ticked_indices=ticked_indices,
+            cursor_index=cursor_index,
+            minimal_count=minimal_count,
+            maximal_count=maximal_count,
+            return_indices=return_indices,
+            strict=strict,
+            pagination=pagination,
+            page_size=page_size,
+            cache_preprocessed=cache_preprocessed,
+            type_ahead=type_ahead,
+            columns=columns,
+        ),
+        _read_key,
+    )
+
 
-    if not options:
+def _select_multiple(
+    options: Union[List[Union[str, T]], Iterable[Union[str, T]]],
+    preprocessor: Callable[[T], str],
+    tick_character: str,
+    tick_style: str,
+    cursor_style: str,
+    ticked_indices: Optional[List[int]],
+    cursor_index: int,
+    minimal_count: int,
+    maximal_count: Optional[int],
+    return_indices: bool,
+    strict: bool,
+    pagination: bool,
+    page_size: int,
+    cache_preprocessed: bool,
+    type_ahead: bool,
+    columns: Optional[List[Column]],
+) -> Generator[None, Key, List[Union[int, Any]]]:
+    console = _get_console()
+
+    if not isinstance(options, Sequence):
+        lazy_options = _LazyOptions(options, Config.options_chunk_size)
+        # Pre-ticked options are loaded too, as they are part of the result whether or not the cursor reaches them
+        lazy_options.load_until(max([cursor_index + max(page_size, console.height)] + (ticked_indices or [])))
+        options = lazy_options
+    if not options and not isinstance(options, OptionFeed):
         if strict:
             raise ValueError('`options` cannot be empty')
         return []
@@ -397,38 +827,200 @@ def select_multiple(
     if ticked_indices is None:
         ticked_indices = []
 
-    renderer = partial(_render_select_multiple, preprocessor, tick_character, tick_style, cursor_style)
+    table = _Table(options, columns, _display_width(tick_character) + 3) if columns else None
+    indexed_preprocessor = table or _index_preprocessor(preprocessor, cache_preprocessed, Config.preprocessor_cache_size)
+    renderer = partial(_render_select_multiple, indexed_preprocessor, tick_character, tick_style, cursor_style)
+    if table is not None:
+        renderer = partial(_render_select_table, table, renderer)
+    typed_prefix = _TypeAhead(options, indexed_preprocessor, Config.type_ahead_timeout)
+
+    state = _SelectState(
+        options=options,
+        title='',
+        select_multiple=True,
+        index=cursor_index,
+        selected_indexes=dict.fromkeys(ticked_indices),
+        pagination=pagination,
+        page_size=page_size,
+        viewport_size=None if pagination else max(1, console.height - _VIEWPORT_RESERVED_LINES - (table is not None)),
+    )
+    _scroll_viewport(state)
 
-    element = qselect.Select(
-        qselect.SelectState(
-            options=options,
-            title='',
-            select_multiple=True,
-            index=cursor_index,
-            selected_indexes=ticked_indices,
-            pagination=pagination,
-            page_size=page_size,
-        ),
+    element = _Select(
+        state,
         renderer=renderer,
         transient=Config.transient,
         console=console,
+        max_fps=Config.max_fps,
+        diff_rendering=Config.diff_rendering,
+        name='select_multiple',
+        stats_callback=Config.render_stats,
     )
+    keymap = _keymap()
 
-    with element.displayed():
+    refresh = partial(element.replace_state, partial(_refresh_select, options=options, matcher=None, table=table))
+    with element.displayed(), _feed_redraws(options, refresh, Config.feed_refresh_interval):
         while True:
-            keypress = get_key()
-            new_state = element.state
-            new_state.error = ''
-
-            new_state = _navigate_select_multiple(new_state, keypress, minimal_count, maximal_count)
-            if new_state.exit or new_state.abort:
-                break
-            element.state = new_state
+            keypress = yield
+            with element.handling_key():
+                new_state = element.state
+                new_state.error = ''
+
+                actions = keymap.actions(keypress)
+                if type_ahead and not actions and _is_printable(keypress):
+                    new_state = _jump_select(new_state, keypress, typed_prefix, options)
+                elif 'tab' in actions and table is not None:
+                    new_state = _sort_select(new_state, table, options)
+                else:
+                    typed_prefix.reset()
+                    new_state = _navigate_select_multiple(new_state, keypress, actions, minimal_count, maximal_count)
+                if new_state.exit or new_state.abort:
+                    break
+                element.state = new_state
         if return_indices:
-            return new_state.selected_indexes  # type: ignore
+            return list(new_state.selected_indexes)
         return [options[i] for i in new_state.selected_indexes]
 
 
+def select_tree(
+    roots: Iterable[T],
+    children: Callable[[T], Iterable[T]],
+    has_children: Callable[[T], bool] = lambda node: True,
+    preprocessor: Callable[[T], str] = lambda val: str(val),
+    cursor: str = '>',
+    cursor_style: str = 'pink1',
+    return_path: bool = False,
+    strict: bool = False,
+) -> Union[T, List[T], None]:
+    """A prompt that allows selecting one node of a tree, whose children are loaded as nodes are expanded
+
+    Right arrow expands the node under the cursor or moves into it if it is expanded already, left arrow collapses it
+    or moves to its parent, space toggles it.
+
+    Args:
+        roots (Iterable[T]): Nodes shown at the top level.
+        children (Callable[[T], Iterable[T]]): Returns the children of a node, called once per node, when it is expanded for
+                                               the first time.
+        has_children (Callable[[T], bool], optional): Tells whether a node can be expanded, without loading its children. Nodes
+                                                      that turn out to have no children become leaves once expanded.
+                                                      Defaults to `lambda node: True`.
+        preprocessor (Callable[[T], str], optional): A callable that can be used to preprocess the nodes prior to printing,
+                                                     called once per node. Defaults to `lambda val: str(val)`.
+        cursor (str, optional): Cursor that is going to appear in front of currently selected node. Defaults to '>'.
+        cursor_style (str, optional): Rich friendly style for the cursor. Defaults to 'pink1'.
+        return_path (bool, optional): If `True`, the list of nodes from the root down to the selected node is returned instead
+                                      of the node alone. Defaults to False.
+        strict (bool, optional): If empty `roots` are provided and strict is `False`, None will be returned,
+                                 if it's `True`, `ValueError` will be thrown. Defaults to False.
+
+    Raises:
+        ValueError: Thrown if no `roots` are provided and strict is `True`
+        KeyboardInterrupt: Raised when keyboard interrupt is encountered and Config.raise_on_interrupt is True
+
+    Returns:
+        Union[T, List[T], None]: Selected node, the path to it or `None`
+    """
+    return _drive(
+        _select_tree(
+            roots=roots,
+            children=children,
+            has_children=has_children,
+            preprocessor=preprocessor,
+            cursor=cursor,
+            cursor_style=cursor_style,
+            return_path=return_path,
+            strict=strict,
+        ),
+        _read_key,
+    )
+
+
+def _select_tree(
+    roots: Iterable[T],
+    children: Callable[[T], Iterable[T]],
+    has_children: Callable[[T], bool],
+    preprocessor: Callable[[T], str],
+    cursor: str,
+    cursor_style: str,
+    return_path: bool,
+    strict: bool,
+) -> Generator[None, Key, Union[T, List[T], None]]:
+    console = _get_console()
+
+    tree = _TreeView(roots, children, has_children)
+    if not tree.visible:
+        if strict:
+            raise ValueError('`roots` cannot be empty')
+        return None
+    if cursor_style in ['', None]:
+        warnings.warn('`cursor_style` should be a valid style, defaulting to `white`')
+        cursor_style = 'white'
+
+    state = _SelectState(
+        options=tree.visible,
+        title='',
+        viewport_size=max(1, console.height - _VIEWPORT_RESERVED_LINES),
+    )
+
+    element = _Select(
+        state,
+        renderer=partial(_render_select_tree, preprocessor, cursor_style, cursor),
+        transient=Config.transient,
+        console=console,
+        max_fps=Config.max_fps,
+        diff_rendering=Config.diff_rendering,
+        name='select_tree',
+        stats_callback=Config.render_stats,
+    )
+    keymap = _keymap()
+
+    with element.displayed():
+        while True:
+            keypress = yield
+            element.key_read()
+            actions = keymap.actions(keypress)
+            state = element.state
+            node = tree.visible[state.index]
+
+            if 'right' in actions:
+                if node.expanded and node.children:
+                    state.index += 1
+                else:
+                    tree.expand(state.index)
+            elif 'left' in actions:
+                parent = tree.parent_position(state.index)
+                if node.expanded:
+                    tree.collapse(state.index)
+                elif parent is not None:
+                    state.index = parent
+            elif 'select' in actions:
+                if node.expanded:
+                    tree.collapse(state.index)
+                else:
+                    tree.expand(state.index)
+            elif actions & _NAVIGATION_ACTIONS:
+                state = _navigate_select(state, actions)
+            elif 'confirm' in actions:
+                if not return_path:
+                    return cast(T, node.value)
+                path: List[T] = []
+                step: Optional[_TreeNode] = node
+                while step is not None:
+                    path.append(step.value)
+                    step = step.parent
+                return path[::-1]
+            elif 'escape' in actions:
+                if Config.raise_on_escape:
+                    raise Abort(keypress)
+                return None
+            elif 'interrupt' in actions:
+                if Config.raise_on_interrupt:
+                    raise KeyboardInterrupt()
+                return None
+            _scroll_viewport(state)
+            element.state = state
+
+
 def confirm(
     question: str,
     yes_text: str = 'Yes',
@@ -459,8 +1051,37 @@ def confirm(
     Returns:
         Optional[bool]
     """
-    rendered = ''
-    with _cursor_hidden(console), Live(rendered, console=console, auto_refresh=False, transient=Config.transient) as live:
+    return _drive(
+        _confirm(
+            question=question,
+            yes_text=yes_text,
+            no_text=no_text,
+            has_to_match_case=has_to_match_case,
+            enter_empty_confirms=enter_empty_confirms,
+            default_is_yes=default_is_yes,
+            cursor=cursor,
+            cursor_style=cursor_style,
+            char_prompt=char_prompt,
+        ),
+        _read_keys,
+    )
+
+
+def _confirm(
+    question: str,
+    yes_text: str,
+    no_text: str,
+    has_to_match_case: bool,
+    enter_empty_confirms: bool,
+    default_is_yes: bool,
+    cursor: str,
+    cursor_style: str,
+    char_prompt: bool,
+) -> Generator[None, List[Key], Optional[bool]]:
+    console = _get_console()
+    with _render_stats('confirm', console, Config.render_stats) as stats, _cursor_hidden(console), _bracketed_paste(console), _live_display(
+        console, Config.transient, Config.diff_rendering
+    ) as live, _RenderScheduler(live, Config.max_fps, stats) as scheduler:
         if cursor_style in ['', None]:
             warnings.warn('`cursor_style` should be a valid style, defaulting to `white`')
             cursor_style = 'white'
@@ -470,6 +1091,7 @@ def confirm(
         yn_prompt = f' ({yes_text[0]}/{no_text[0]}) ' if char_prompt else ': '
         selected_prefix = f'[{cursor_style}]{cursor}[/{cursor_style}] '
         deselected_prefix = (' ' * len(cursor)) + ' '
+        keymap = _keymap()
         while True:
             yes = is_yes and is_selected
             no = not is_yes and is_selected
@@ -477,45 +1099,48 @@ def confirm(
             yes_prefix = selected_prefix if yes else deselected_prefix
             no_prefix = selected_prefix if no else deselected_prefix
             rendered = f'{question_line}\n{yes_prefix}{yes_text}\n{no_prefix}{no_text}\n\n([bold]enter[/bold] to confirm)'
-            _update_rendered(live, rendered)
-
-            keypress = get_key()
-            if keypress in DefaultKeys.interrupt:
-                if Config.raise_on_interrupt:
-                    raise KeyboardInterrupt()
-                return None
-            elif keypress in DefaultKeys.down or keypress in DefaultKeys.up:
-                is_yes = not is_yes
-                is_selected = True
-                current_message = yes_text if is_yes else no_text
-            elif keypress in DefaultKeys.backspace:
-                if current_message:
-                    current_message = current_message[:-1]
-            elif keypress in DefaultKeys.confirm:
-                if is_selected:
-                    break
-            elif keypress in DefaultKeys.tab:
-                if is_selected:
-                    current_message = yes_text if is_yes else no_text
-            elif keypress in DefaultKeys.escape:
-                if Config.raise_on_escape:
-                    raise Abort(keypress)
-                return None
-            else:
-                current_message += str(keypress)
-                match_yes = yes_text
-                match_no = no_text
-                match_text = current_message
-                if not has_to_match_case:
-                    match_yes = match_yes.upper()
-                    match_no = match_no.upper()
-                    match_text = match_text.upper()
-                if match_no.startswith(match_text):
-                    is_selected = True
-                    is_yes = False
-                elif match_yes.startswith(match_text):
+            scheduler.submit(rendered)
+
+            keys = yield
+            if stats is not None:
+                stats.key_read(len(keys))
+            for keypress in keys:
+                actions = keymap.actions(keypress)
+                if 'interrupt' in actions:
+                    if Config.raise_on_interrupt:
+                        raise KeyboardInterrupt()
+                    return None
+                elif 'down' in actions or 'up' in actions:
+                    is_yes = not is_yes
                     is_selected = True
-                    is_yes = True
+                    current_message = yes_text if is_yes else no_text
+                elif 'backspace' in actions:
+                    if current_message:
+                        current_message = current_message[:-1]
+                elif 'confirm' in actions:
+                    if is_selected:
+                        return is_yes
+                elif 'tab' in actions:
+                    if is_selected:
+                        current_message = yes_text if is_yes else no_text
+                elif 'escape' in actions:
+                    if Config.raise_on_escape:
+                        raise Abort(keypress)
+                    return None
                 else:
-                    is_selected = False
-        return is_selected and is_yes
+                    current_message += str(keypress)
+                    match_yes = yes_text
+                    match_no = no_text
+                    match_text = current_message
+                    if not has_to_match_case:
+                        match_yes = match_yes.upper()
+                        match_no = match_no.upper()
+                        match_text = match_text.upper()
+                    if match_no.startswith(match_text):
+                        is_selected = True
+                        is_yes = False
+                    elif match_yes.startswith(match_text):
+                        is_selected = True
+                        is_yes = True
+                    else:
+                        is_selected = False
@@ -0,0 +1,125 @@
+import io
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from rich.console import Console, ConsoleRenderable
+from yakh.key import Key
+
+from beaupy import _beaupy, _internals
+from beaupy._internals import LiveDisplay, _to_key
+
+_MISSING = object()
+
+
+@dataclass
+class HeadlessFrame:
+    """A frame painted during a headless session
+
+    Attributes:
+        renderable(Union[ConsoleRenderable, str]): What the element asked to be drawn.
+        at(float): Seconds since the session started when the frame was painted.
+        duration(float): Seconds spent drawing the frame onto the console.
+    """
+
+    renderable: Union[ConsoleRenderable, str]
+    at: float
+    duration: float
+
+
+class HeadlessSession:
+    """Replays scripted keypresses through beaupy's elements without a terminal.
+
+    While the session is active, `select`, `select_multiple`, `prompt` and `confirm` read their keys from `keys` instead
+    of the keyboard and draw onto an in-memory console, so whole interactive flows run as fast as they can be rendered.
+    Every painted frame is recorded together with its timing. Sessions patch beaupy globally, so elements must not be
+    shown from other threads while one is active.
+
+    Example:
+        >>> with HeadlessSession([Keys.DOWN_ARROW, Keys.ENTER]) as session:
+        ...     choice = select(['a', 'b'])
+        >>> choice, session.frame_count
+        ('b', 2)
+
+    Attributes:
+        console(Console): The in-memory console elements draw onto.
+        frames(List[HeadlessFrame]): Frames painted so far.
+        keys_read(int): Number of keys consumed from the script.
+        elapsed(float): Seconds the session has been (or was) active.
+    """
+
+    console: Console
+    frames: List[HeadlessFrame]
+    keys_read: int
+
+    def __init__(self, keys: Iterable[Union[Key, Tuple[int, ...], str]], width: int = 80, height: int = 25) -> None:
+        """Creates a session replaying `keys`
+
+        Args:
+            keys (Iterable[Union[Key, Tuple[int, ...], str]]): Keys in the order they are pressed, e.g. `Keys.ENTER` or a
+                                                              single character. Once they run out, reading another key
+                                                              raises EOFError.
+            width (int, optional): Width of the in-memory console. Defaults to 80.
+            height (int, optional): Height of the in-memory console. Defaults to 25.
+        """
+        self._keys: Iterator[Union[Key, Tuple[int, ...], str]] = iter(keys)
+        self.console = Console(file=io.StringIO(), width=width, height=height, force_terminal=True, color_system=None)
+        self.frames = []
+        self.keys_read = 0
+        self._patched: List[Tuple[ModuleType, str, Any]] = []
+        self._started: Optional[float] = None
+        self._stopped: Optional[float] = None
+        self._update_rendered = _internals._update_rendered
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frames)
+
+    @property
+    def output(self) -> str:
+        """Everything written to the in-memory console, including cursor movements"""
+        file = self.console.file
+        return file.getvalue() if isinstance(file, io.StringIO) else ''
+
+    @property
+    def elapsed(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._stopped if self._stopped is not None else time.perf_counter()) - self._started
+
+    def __enter__(self) -> 'HeadlessSession':
+        self._patch(_beaupy, 'get_key', self._get_key)
+        self._patch(_beaupy, '_input_pending', lambda: False)
+        self._patch(_beaupy, 'console', self.console)
+        self._patch(_internals, '_update_rendered', self._paint)
+        self._started = time.perf_counter()
+        self._stopped = None
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._stopped = time.perf_counter()
+        while self._patched:
+            module, name, previous = self._patched.pop()
+            if previous is _MISSING:
+                delattr(module, name)
+            else:
+                setattr(module, name, previous)
+
+    def _patch(self, module: ModuleType, name: str, value: Any) -> None:
+        self._patched.append((module, name, vars(module).get(name, _MISSING)))
+        setattr(module, name, value)
+
+    def _get_key(self) -> Key:
+        try:
+            key = next(self._keys)
+        except StopIteration:
+            raise EOFError('Scripted keys ran out before the element finished') from None
+        self.keys_read += 1
+        return _to_key(key)
+
+    def _paint(self, live: LiveDisplay, renderable: Union[ConsoleRenderable, str]) -> None:
+        started = time.perf_counter()
+        self._update_rendered(live, renderable)
+        finished = time.perf_counter()
+        self.frames.append(HeadlessFrame(renderable, started - (self._started or started), finished - started))
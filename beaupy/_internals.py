@@ -1,20 +1,58 @@
 import copy
 import math
+import numbers
 import re
+import sys
+import threading
+import time
 from ast import literal_eval
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Sequence
 from contextlib import contextmanager
-from typing import Any, Callable, Iterator, List, Tuple, Type, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice, repeat
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Sized,
+    Tuple,
+    Type,
+    Union,
+)
 
-import emoji
 from questo import prompt as qprompt
 from questo import select as qselect
+from questo.abstract.abstract_element import GenericElement
+from rich.cells import cell_len
 from rich.console import Console, ConsoleRenderable
 from rich.live import Live
+from rich.markup import escape
 from rich.style import Style
+from rich.text import Text
+from yakh import _yakh
 from yakh.key import Key, Keys
 
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # type: ignore
+
 TargetType = Any
 
+_PASTE_START = '\x1b[200~'
+_PASTE_END = '\x1b[201~'
+IndexedPreprocessor = Callable[[int, Any], str]
+
 
 class ValidationError(Exception):
     pass
@@ -32,38 +70,1256 @@ class Abort(Exception):
         self.key = key
 
 
-def _replace_emojis(text: str) -> str:
-    return str(emoji.replace_emoji(text, '  '))
+@dataclass
+class _SelectState(qselect.SelectState):
+    # Insertion ordered, so that the order of ticking is kept while membership checks and unticking stay O(1)
+    selected_indexes: Dict[int, None] = field(default_factory=dict)
+    viewport_size: Optional[int] = None
+    viewport_offset: int = 0
+    # Options are laid out row by row, `viewport_size` counts rows
+    columns: int = 1
+    column_width: int = 0
+    # Display widths of the options by source index, measured once by the grid layout to pad its cells
+    option_widths: Sequence[int] = ()
 
 
-def _render_option_select(i: int, cursor_index: int, option: str, cursor_style: str, cursor: str) -> str:
-    return '{}{}'.format(
-        f'[{cursor_style}]{cursor}[/{cursor_style}] ' if i == cursor_index else ' ' * (len(_replace_emojis(cursor)) + 1), option
-    )
+class _DiffLive:
+    """Stand-in for rich's Live that rewrites only the lines which changed since the previous frame.
 
+    The cursor position relative to the top of the frame is tracked, so that changed lines are reached with
+    cursor movements instead of repainting the whole frame. `bytes_written` counts everything sent to the terminal.
+    """
 
-def _wrap_style(string_w_styles: str, global_style_str: str) -> str:
-    RE_STYLE_PATTERN = r'\[(/?[^]]+)\]'
+    console: Console
+    transient: bool
+    bytes_written: int
+    _renderable: Union[ConsoleRenderable, str]
+    _lines: List[str]
+    _cursor_row: int
+
+    def __init__(self, renderable: Union[ConsoleRenderable, str] = '', console: Optional[Console] = None, transient: bool = True) -> None:
+        self.console = console or Console()
+        self.transient = transient
+        self.bytes_written = 0
+        self._renderable = renderable
+        self._lines = []
+        self._cursor_row = 0
+
+    def __enter__(self) -> '_DiffLive':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def update(self, renderable: Union[ConsoleRenderable, str], *, refresh: bool = False) -> None:
+        self._renderable = renderable
+        if refresh:
+            self.refresh()
+
+    def refresh(self) -> None:
+        with self.console.capture() as capture:
+            self.console.print(self._renderable, end='')
+        lines = capture.get().split('\n')[: self.console.height]
+
+        output = []
+        for row, line in enumerate(lines):
+            if row >= len(self._lines) or self._lines[row] != line:
+                output.append(f'{self._move_to(row)}\r{line}\x1b[K')
+        if len(lines) < len(self._lines):
+            output.append(f'{self._move_to(len(lines))}\r\x1b[J')
+        self._lines = lines
+        self._write(''.join(output))
+
+    def stop(self) -> None:
+        if not self._lines:
+            return
+        if self.transient:
+            self._write(f'{self._move_to(0)}\r\x1b[J')
+        else:
+            self._write(f'{self._move_to(len(self._lines) - 1)}\n')
+        self._lines = []
+        self._cursor_row = 0
+
+    def _move_to(self, row: int) -> str:
+        # Moving down with newlines rather than cursor movements, so that the frame can grow past the bottom of the screen
+        movement = (
+            '\n' * (row - self._cursor_row)
+            if row > self._cursor_row
+            else f'\x1b[{self._cursor_row - row}A' if row < self._cursor_row else ''
+        )
+        self._cursor_row = row
+        return movement
+
+    def _write(self, output: str) -> None:
+        if output:
+            self.console.file.write(output)
+            self.console.file.flush()
+            self.bytes_written += len(output.encode('utf-8'))
+
+
+LiveDisplay = Union[Live, _DiffLive]
+
+
+def _live_display(console: Console, transient: bool, diff_rendering: bool = False) -> LiveDisplay:
+    if diff_rendering:
+        return _DiffLive('', console=console, transient=transient)
+    return Live('', console=console, auto_refresh=False, transient=transient)
+
+
+@dataclass
+class RenderStats:
+    """Rendering measurements of a single element invocation, delivered to `Config.render_stats`
+
+    Attributes:
+        element(str): Name of the element, e.g. `select`.
+        frames(int): Number of frames painted.
+        render_time(float): Seconds spent turning states into renderables.
+        write_time(float): Seconds spent drawing renderables onto the terminal.
+        bytes_written(int): Bytes written to the terminal, cursor movements included.
+        latencies(List[float]): Seconds from reading each key to painting the first frame reflecting it.
+    """
+
+    element: str
+    frames: int = 0
+    render_time: float = 0.0
+    write_time: float = 0.0
+    bytes_written: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Returns the nearest-rank percentile of key-to-paint latencies, e.g. 95 for the p95, or None without keys"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+class _StatsRecorder:
+    """Collects RenderStats, frames may be painted from the render scheduler's timer thread"""
+
+    stats: RenderStats
+    _keys_read_at: List[float]
+    _lock: threading.Lock
+
+    def __init__(self, element: str) -> None:
+        self.stats = RenderStats(element)
+        self._keys_read_at = []
+        self._lock = threading.Lock()
+
+    def key_read(self, count: int = 1) -> None:
+        with self._lock:
+            self._keys_read_at.extend(repeat(time.perf_counter(), count))
+
+    def rendered(self, seconds: float) -> None:
+        with self._lock:
+            self.stats.render_time += seconds
+
+    def painted(self, started: float, finished: float) -> None:
+        with self._lock:
+            self.stats.frames += 1
+            self.stats.write_time += finished - started
+            self.stats.latencies.extend(finished - read_at for read_at in self._keys_read_at)
+            self._keys_read_at.clear()
+
+    def written(self, count: int) -> None:
+        with self._lock:
+            self.stats.bytes_written += count
+
+
+class _CountingFile:
+    """Passes writes through to a file while counting the bytes written"""
+
+    def __init__(self, file: IO[str], recorder: _StatsRecorder) -> None:
+        self._file = file
+        self._recorder = recorder
+
+    def write(self, text: str) -> int:
+        self._recorder.written(len(text.encode('utf-8')))
+        return self._file.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+
+@contextmanager
+def _render_stats(element: str, console: Console, callback: Optional[Callable[[RenderStats], Any]]) -> Iterator[Optional[_StatsRecorder]]:
+    if callback is None:
+        yield None
+        return
+    recorder = _StatsRecorder(element)
+    # Set through the private attribute, so that a console writing to sys.stderr keeps following it afterwards
+    previous_file = console._file
+    console._file = _CountingFile(console.file, recorder)  # type: ignore[assignment]
+    try:
+        yield recorder
+    finally:
+        console._file = previous_file
+        callback(recorder.stats)
+
+
+class _RenderScheduler:
+    """Coalesces redraws of a live display into at most `max_fps` frames a second.
+
+    Frames submitted too early are held back, each replacing the previous one, and painted by a timer once the
+    interval passes, so the last state is always displayed. Frames are rendered by the caller, the timer thread
+    only writes them out.
+    """
+
+    _live: LiveDisplay
+    _stats: Optional[_StatsRecorder]
+    _interval: float
+    _lock: threading.Lock
+    _pending: Optional[Union[ConsoleRenderable, str]]
+    _last_frame: float
+    _timer: Optional[threading.Timer]
+
+    def __init__(self, live: LiveDisplay, max_fps: Optional[float] = None, stats: Optional[_StatsRecorder] = None) -> None:
+        self._live = live
+        self._stats = stats
+        self._interval = 1 / max_fps if max_fps else 0.0
+        self._lock = threading.Lock()
+        self._pending = None
+        self._last_frame = -math.inf
+        self._timer = None
+
+    def __enter__(self) -> '_RenderScheduler':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.flush()
+
+    def submit(self, renderable: Union[ConsoleRenderable, str]) -> None:
+        with self._lock:
+            delay = self._last_frame + self._interval - time.monotonic()
+            if delay <= 0:
+                self._pending = None
+                self._paint(renderable)
+                return
+            self._pending = renderable
+            if self._timer is None:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending is not None:
+                self._paint(self._pending)
+                self._pending = None
+
+    def cancel(self) -> None:
+        """Drops the frame held back, if any, without painting it"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+
+    def _paint(self, renderable: Union[ConsoleRenderable, str]) -> None:
+        started = time.perf_counter()
+        _update_rendered(self._live, renderable)
+        if self._stats is not None:
+            self._stats.painted(started, time.perf_counter())
+        self._last_frame = time.monotonic()
+
+
+class _Element(GenericElement):
+    # questo deep-copies the state (options included) on every read and write unless told otherwise,
+    # which makes each keypress O(len(options))
+    _copy = False
+    _max_fps: Optional[float] = None
+    _diff_rendering: bool = False
+    _live: Optional[LiveDisplay] = None
+    _scheduler: Optional[_RenderScheduler] = None
+    _name: str = ''
+    _stats_callback: Optional[Callable[[RenderStats], Any]] = None
+    _stats: Optional[_StatsRecorder] = None
+    _update_lock: threading.RLock
+
+    def __init__(
+        self,
+        state: Any,
+        renderer: Callable[[Any], str],
+        console: Console,
+        transient: bool = True,
+        max_fps: Optional[float] = None,
+        diff_rendering: bool = False,
+        name: str = '',
+        stats_callback: Optional[Callable[[RenderStats], Any]] = None,
+    ) -> None:
+        self._max_fps = max_fps
+        self._diff_rendering = diff_rendering
+        self._name = name
+        self._stats_callback = stats_callback
+        self._update_lock = threading.RLock()
+        GenericElement.__init__(self, state=state, renderer=renderer, console=console, copy=False, transient=transient)
+
+    @contextmanager
+    def displayed(self, console: Optional[Console] = None) -> Iterator[None]:
+        if console is not None:
+            self._console = console
+        if self._state is None:
+            yield
+            return
+        with _render_stats(self._name, self._console, self._stats_callback) as stats, _cursor_hidden(self._console), _live_display(
+            self._console, self.transient, self._diff_rendering
+        ) as live:
+            self._live = live
+            self._stats = stats
+            try:
+                self.state = self._state
+                yield
+                if self._scheduler is not None:
+                    self._scheduler.flush()
+            finally:
+                # Left by an exception, e.g. an abort, a held back frame must not be painted once the element is gone
+                if self._scheduler is not None:
+                    self._scheduler.cancel()
+                self._live = None
+                self._scheduler = None
+                self._stats = None
+
+    def key_read(self, count: int = 1) -> None:
+        """Marks keys as read, the next painted frame closes their key-to-paint latency"""
+        if self._stats is not None:
+            self._stats.key_read(count)
+
+    @contextmanager
+    def handling_key(self) -> Iterator[None]:
+        """Marks a key as read and holds off redraws from option feeds until it is handled.
+
+        Handling a key changes the state and the caches the renderer reads, so a redraw running in between would see them
+        half updated.
+        """
+        self.key_read()
+        with self._update_lock:
+            yield
+
+    def replace_state(self, change: Callable[[Any], Any]) -> None:
+        """Replaces the state by `change` applied to it from another thread, e.g. once options arrived to a feed"""
+        with self._update_lock:
+            self.state = change(self._state)
+
+    def update(self) -> None:
+        # Option feeds redraw from their producers' threads, while keypresses redraw from the element's own
+        with self._update_lock:
+            if self._live is None:
+                return
+            if self._scheduler is None:
+                self._scheduler = _RenderScheduler(self._live, self._max_fps, self._stats)
+            started = time.perf_counter()
+            renderable = self.renderer(self._state)
+            if self._stats is not None:
+                self._stats.rendered(time.perf_counter() - started)
+            self._scheduler.submit(renderable)
+
+
+class _Select(_Element, qselect.Select):
+    pass
+
+
+class _EditBuffer:
+    """Gap buffer holding the text typed into a prompt.
+
+    Characters before the gap are kept in order, characters after it in reverse order, so that edits at the
+    gap are amortized O(1) and moving the gap costs only the distance it moves.
+    """
+
+    _before: List[str]
+    _after: List[str]
+    _text: Optional[str]
+
+    def __init__(self, text: str = '') -> None:
+        self._before = list(text)
+        self._after = []
+        self._text = text
+
+    def _move_gap(self, position: int) -> None:
+        while len(self._before) > position:
+            self._after.append(self._before.pop())
+        while len(self._before) < position and self._after:
+            self._before.append(self._after.pop())
+
+    def insert(self, position: int, text: str) -> None:
+        self._move_gap(position)
+        self._before.extend(text)
+        self._text = None
+
+    def delete(self, position: int, count: int = 1) -> None:
+        self._move_gap(position)
+        del self._after[max(0, len(self._after) - count) :]  # noqa: E203
+        self._text = None
+
+    def __len__(self) -> int:
+        return len(self._before) + len(self._after)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = ''.join(self._before) + ''.join(reversed(self._after))
+        return self._text
+
+
+@dataclass
+class _PromptState(qprompt.PromptState):
+    """questo's PromptState with its `value` backed by an edit buffer, which key handling edits in place"""
+
+    @property
+    def value(self) -> Optional[str]:
+        return None if self._buffer is None else str(self._buffer)
+
+    @value.setter
+    def value(self, value: Optional[str]) -> None:
+        self._buffer = None if value is None else _EditBuffer(value)
+
+    @property
+    def buffer(self) -> _EditBuffer:
+        if self._buffer is None:
+            self._buffer = _EditBuffer()
+        return self._buffer
+
+
+class _Prompt(_Element, qprompt.Prompt):
+    pass
+
+
+class _CompletionProvider:
+    """Computes prompt completions on a background thread while the user is typing.
+
+    Requests are debounced and only the latest one is computed, stale ones are dropped before they start.
+    Results are cached per prefix; if every option of a cached result starts with its prefix, a longer
+    prefix is completed by filtering that result instead of calling `completion` again.
+    """
+
+    _completion: Callable[[str], List[str]]
+    _debounce: float
+    _cache: Dict[str, Tuple[List[str], bool]]
+    _pending: Optional[str]
+    _computing: Optional[str]
+    _requested_at: float
+    _closed: bool
+    _condition: threading.Condition
+    _thread: threading.Thread
+
+    def __init__(self, completion: Callable[[str], List[str]], debounce: float = 0.1) -> None:
+        self._completion = completion
+        self._debounce = debounce
+        self._cache = {}
+        self._pending = None
+        self._computing = None
+        self._requested_at = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> '_CompletionProvider':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def request(self, prefix: str) -> None:
+        with self._condition:
+            if self._lookup(prefix) is None and prefix != self._computing:
+                self._pending = prefix
+                self._requested_at = time.monotonic()
+                self._condition.notify_all()
+
+    def get(self, prefix: str) -> List[str]:
+        with self._condition:
+            while self._computing == prefix:
+                self._condition.wait()
+            options = self._lookup(prefix)
+            if options is not None:
+                return options
+            if self._pending == prefix:
+                self._pending = None
+        options = self._completion(prefix)
+        with self._condition:
+            self._store(prefix, options)
+        return list(options)
+
+    def _lookup(self, prefix: str) -> Optional[List[str]]:
+        if prefix in self._cache:
+            return list(self._cache[prefix][0])
+        for length in range(len(prefix) - 1, -1, -1):
+            options, prefix_closed = self._cache.get(prefix[:length], ([], False))
+            if prefix_closed:
+                narrowed = [option for option in options if option.startswith(prefix)]
+                self._cache[prefix] = (narrowed, True)
+                return list(narrowed)
+        return None
+
+    def _store(self, prefix: str, options: List[str]) -> None:
+        self._cache[prefix] = (list(options), all(option.startswith(prefix) for option in options))
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and self._pending is None:
+                    self._condition.wait()
+                prefix = self._pending
+                if self._closed or prefix is None:
+                    return
+                delay = self._requested_at + self._debounce - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                self._pending, self._computing = None, prefix
+            try:
+                options: Optional[List[str]] = self._completion(prefix)
+            except Exception:
+                # Left for `get` to recompute, so that the error surfaces on the input thread
+                options = None
+            with self._condition:
+                if options is not None:
+                    self._store(prefix, options)
+                self._computing = None
+                self._condition.notify_all()
+
+
+class _PreprocessorCache:
+    _preprocessor: Callable[[Any], str]
+    _maxsize: Optional[int]
+    _cache: 'OrderedDict[int, str]'
+
+    def __init__(self, preprocessor: Callable[[Any], str], maxsize: Optional[int] = None) -> None:
+        self._preprocessor = preprocessor
+        self._maxsize = maxsize
+        self._cache = OrderedDict()
+
+    def __call__(self, index: int, option: Any) -> str:
+        try:
+            preprocessed = self._cache[index]
+        except KeyError:
+            preprocessed = self._preprocessor(option)
+            self._cache[index] = preprocessed
+            if self._maxsize is not None and len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+            return preprocessed
+        if self._maxsize is not None:
+            self._cache.move_to_end(index)
+        return preprocessed
+
+
+class OptionFeed(Sequence):
+    """Options which keep arriving while `select` or `select_multiple` is displayed.
+
+    Producers append options from any thread, or from the event loop when used with `beaupy.aio`. The element redraws
+    as batches arrive, at most once every `Config.feed_refresh_interval` seconds, keeping the cursor and the ticked
+    options where they are. Unlike other empty options, an empty feed is displayed, waiting for its options.
+    """
+
+    _options: List[Any]
+    _listeners: List[Callable[[], None]]
+    _lock: threading.Lock
+
+    def __init__(self, options: Iterable[Any] = ()) -> None:
+        """Creates a feed
+
+        Args:
+            options (Iterable[Any], optional): Options available right away. Defaults to none.
+        """
+        self._options = list(options)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def append(self, option: Any) -> None:
+        self.extend([option])
+
+    def extend(self, options: Iterable[Any]) -> None:
+        with self._lock:
+            self._options.extend(options)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def _subscribe(self, listener: Callable[[], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _unsubscribe(self, listener: Callable[[], None]) -> None:
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def __len__(self) -> int:
+        return len(self._options)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._options[index]
+
+
+@contextmanager
+def _feed_redraws(options: Sequence, redraw: Callable[[], None], interval: float) -> Iterator[None]:
+    """Calls `redraw` once per `interval` while options keep arriving to an OptionFeed, nothing for other options"""
+    if not isinstance(options, OptionFeed):
+        yield
+        return
+
+    lock = threading.Lock()
+    timer: Optional[threading.Timer] = None
+
+    def fire() -> None:
+        nonlocal timer
+        with lock:
+            timer = None
+        redraw()
+
+    def arrived() -> None:
+        nonlocal timer
+        with lock:
+            if timer is None:
+                timer = threading.Timer(interval, fire)
+                timer.daemon = True
+                timer.start()
+
+    options._subscribe(arrived)
+    try:
+        yield
+    finally:
+        options._unsubscribe(arrived)
+        with lock:
+            if timer is not None:
+                timer.cancel()
+
+
+class _LazyOptions(Sequence):
+    """List-like view over an option source that is fetched in chunks as they are needed.
+
+    Sized sources supporting `__getitem__` are accessed randomly chunk by chunk, anything else is consumed
+    as an iterator and its length is the number of options loaded so far until it is exhausted.
+    """
+
+    _chunk_size: int
+    _source: Any
+    _random_access: bool
+    _iterator: Optional[Iterator[Any]]
+    _items: List[Any]
+    _chunks: Dict[int, List[Any]]
+    _length: Optional[int]
+
+    def __init__(self, source: Iterable[Any], chunk_size: int = 100) -> None:
+        self._chunk_size = max(1, chunk_size)
+        self._source = source
+        self._items = []
+        self._chunks = {}
+        self._random_access = isinstance(source, Sized) and hasattr(source, '__getitem__')
+        if self._random_access:
+            self._iterator = None
+            self._length = len(source)  # type: ignore
+        else:
+            self._iterator = iter(source)
+            self._length = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self._length is not None
+
+    def load_until(self, index: int) -> None:
+        while self._length is None and len(self._items) <= index:
+            chunk = list(islice(self._iterator, self._chunk_size))  # type: ignore
+            self._items.extend(chunk)
+            if len(chunk) < self._chunk_size:
+                self._length = len(self._items)
+                self._iterator = None
+
+    def load_all(self) -> None:
+        while self._length is None:
+            self.load_until(len(self._items))
+
+    def __len__(self) -> int:
+        return self._length if self._length is not None else len(self._items)
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('option index out of range')
+        if self._random_access:
+            return self._fetch_chunk(key // self._chunk_size)[key % self._chunk_size]
+        return self._items[key]
+
+    def _fetch_chunk(self, chunk_index: int) -> List[Any]:
+        if chunk_index not in self._chunks:
+            chunk_from = chunk_index * self._chunk_size
+            chunk_to = min(chunk_from + self._chunk_size, len(self))
+            self._chunks[chunk_index] = [self._source[i] for i in range(chunk_from, chunk_to)]
+        return self._chunks[chunk_index]
+
+
+class _FilteredOptions(Sequence):
+    """List-like view over the options matching a filter, keeping track of their indexes in the original options"""
+
+    _options: Sequence
+    _indexes: List[int]
+
+    def __init__(self, options: Sequence, indexes: List[int]) -> None:
+        self._options = options
+        self._indexes = indexes
+
+    def source_index(self, index: int) -> int:
+        return self._indexes[index]
 
-    global_style = Style.parse(global_style_str)
-    style_strings = list(set(re.findall(RE_STYLE_PATTERN, string_w_styles)))
-    for style_string in style_strings:
+    def position(self, source_index: int) -> Optional[int]:
         try:
-            style = Style.combine([Style.parse(style_string), global_style])
-            string_w_styles = string_w_styles.replace(f'[{style_string}]', f'[{style}]')
-            string_w_styles = string_w_styles.replace(f'[/{style_string}]', f'[/{style}]')
-        except Exception:
-            # In the case where there are non style defining square brakets in the string,
-            # ignores invalid colors in square brackets, since these aren't styles
+            return self._indexes.index(source_index)
+        except ValueError:
+            return None
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            return [self._options[i] for i in self._indexes[key]]
+        return self._options[self._indexes[key]]
+
+
+def _source_index(options: Sequence, index: int) -> int:
+    return options.source_index(index) if isinstance(options, _FilteredOptions) else index
+
+
+class _FuzzyMatcher:
+    """Case-insensitive subsequence matcher over preprocessed options.
+
+    The lowercased plain text of the options is computed once, on the first query, and extended when options are
+    appended. Every match remembers where
+    its leftmost subsequence ends, so a query extended by one character only resumes the search in the options
+    matched by the previous query, and a shortened query reuses an earlier result outright.
+    """
+
+    _options: Sequence
+    _preprocessor: IndexedPreprocessor
+    _haystack: Optional[List[str]]
+    _history: List[Tuple[str, List[int], Optional[List[int]]]]
+
+    def __init__(self, options: Sequence, preprocessor: IndexedPreprocessor) -> None:
+        self._options = options
+        self._preprocessor = preprocessor
+        self._haystack = None
+        self._history = []
+
+    def match(self, query: str) -> List[int]:
+        query = query.lower()
+        if self._haystack is None:
+            self._haystack = []
+        if len(self._haystack) < len(self._options):
+            # Options were appended since the last query, e.g. by an OptionFeed, so remembered matches are incomplete
+            known = len(self._haystack)
+            self._haystack.extend(
+                _plain_text(self._preprocessor(i, option)).lower() for i, option in enumerate(self._options[known:], known)
+            )
+            self._history.clear()
+        while self._history and not query.startswith(self._history[-1][0]):
+            self._history.pop()
+
+        haystack = self._haystack
+        if not query:
+            return list(range(len(haystack)))
+        if not self._history:
+            # A plain containment test is the cheapest scan over all the options, ends of the matches are computed once narrowing
+            self._history.append((query[0], [i for i, text in enumerate(haystack) if query[0] in text], None))
+
+        matched_query, indexes, ends = self._history[-1]
+        for char in query[len(matched_query) :]:  # noqa: E203
+            if ends is None:
+                ends = [haystack[i].find(matched_query) + 1 for i in indexes]
+            positions = map(str.find, map(haystack.__getitem__, indexes), repeat(char), ends)
+            matches = [(i, position + 1) for i, position in zip(indexes, positions) if position >= 0]
+            matched_query += char
+            indexes, ends = [i for i, _ in matches], [end for _, end in matches]
+            self._history.append((matched_query, indexes, ends))
+        return indexes
+
+
+class _TypeAhead:
+    """Jumps to the option whose text starts with what was typed, like in file managers.
+
+    The case-folded plain text of the options is sorted together with their indexes once, on the first keystroke, and
+    extended when options are appended, so each keystroke is resolved with a binary search. Typing after a pause longer
+    than `timeout` starts a new prefix.
+    """
+
+    _options: Sequence
+    _preprocessor: IndexedPreprocessor
+    _timeout: float
+    _index: List[Tuple[str, int]]
+    _prefix: str
+    _typed_at: float
+
+    def __init__(self, options: Sequence, preprocessor: IndexedPreprocessor, timeout: float) -> None:
+        self._options = options
+        self._preprocessor = preprocessor
+        self._timeout = timeout
+        self._index = []
+        self._prefix = ''
+        self._typed_at = 0.0
+
+    def jump(self, text: str) -> Optional[int]:
+        """Extends the typed prefix by `text`, returns the index of the first option, in alphabetical order, starting with it"""
+        now = time.monotonic()
+        if now - self._typed_at > self._timeout:
+            self._prefix = ''
+        self._typed_at = now
+        self._prefix += text.casefold()
+
+        if len(self._index) < len(self._options):
+            known = len(self._index)
+            self._index.extend(
+                (_plain_text(self._preprocessor(i, option)).casefold(), i) for i, option in enumerate(self._options[known:], known)
+            )
+            # The sort only orders the appended options and merges them into the already sorted rest
+            self._index.sort()
+
+        position = bisect_left(self._index, (self._prefix, -1))
+        if position < len(self._index) and self._index[position][0].startswith(self._prefix):
+            return self._index[position][1]
+        return None
+
+    def reset(self) -> None:
+        self._prefix = ''
+
+
+_GRID_GAP = '  '
+
+
+class _GridLayout:
+    """Packs the options of a select into as many equally wide columns as fit the console.
+
+    Display widths of the options are measured once, options appended later when they arrive, and kept for padding the
+    cells, so the columns are only recomputed when the console is resized or a wider option shows up, not on every frame.
+    """
+
+    _options: Sequence
+    _preprocessor: IndexedPreprocessor
+    _console: Console
+    _cursor_width: int
+    _widths: List[int]
+    _widest: int
+    _arranged_for: Optional[Tuple[int, int]]
+    _columns: int
+
+    def __init__(self, options: Sequence, preprocessor: IndexedPreprocessor, console: Console, cursor: str) -> None:
+        self._options = options
+        self._preprocessor = preprocessor
+        self._console = console
+        self._cursor_width = _display_width(cursor)
+        self._widths = []
+        self._widest = 0
+        self._arranged_for = None
+        self._columns = 1
+
+    def arrange(self, state: _SelectState) -> None:
+        for i, option in enumerate(self._options[len(self._widths) :], len(self._widths)):  # noqa: E203
+            self._widths.append(_display_width(_plain_text(self._preprocessor(i, option))))
+            self._widest = max(self._widest, self._widths[-1])
+        state.option_widths = self._widths
+
+        column_width = self._cursor_width + 1 + self._widest
+        if self._arranged_for != (self._console.width, column_width):
+            self._arranged_for = (self._console.width, column_width)
+            self._columns = max(1, (self._console.width + len(_GRID_GAP)) // (column_width + len(_GRID_GAP)))
+        if (state.columns, state.column_width) != (self._columns, column_width):
+            state.columns, state.column_width = self._columns, column_width
+            _scroll_viewport(state)
+
+
+@dataclass
+class _TreeNode:
+    value: Any
+    depth: int
+    parent: Optional['_TreeNode']
+    has_children: bool
+    # Loaded when the node is expanded for the first time
+    children: Optional[List['_TreeNode']] = None
+    expanded: bool = False
+    label: Optional[str] = None
+
+
+class _TreeView:
+    """Visible nodes of a lazily loaded tree, flattened in display order.
+
+    Children are requested from `children` when their parent is expanded for the first time. Expanding a node splices
+    its visible descendants in after it and collapsing removes them, so both cost as much as the nodes appearing or
+    disappearing, regardless of how large the rest of the tree is.
+    """
+
+    visible: List[_TreeNode]
+    _children: Callable[[Any], Iterable[Any]]
+    _has_children: Callable[[Any], bool]
+
+    def __init__(self, roots: Iterable[Any], children: Callable[[Any], Iterable[Any]], has_children: Callable[[Any], bool]) -> None:
+        self._children = children
+        self._has_children = has_children
+        self.visible = [_TreeNode(root, 0, None, has_children(root)) for root in roots]
+
+    def expand(self, position: int) -> None:
+        node = self.visible[position]
+        if node.expanded or not node.has_children:
+            return
+        if node.children is None:
+            node.children = [_TreeNode(child, node.depth + 1, node, self._has_children(child)) for child in self._children(node.value)]
+            node.has_children = bool(node.children)
+        node.expanded = node.has_children
+        self.visible[position + 1 : position + 1] = self._visible_descendants(node)  # noqa: E203
+
+    def collapse(self, position: int) -> None:
+        node = self.visible[position]
+        if not node.expanded:
+            return
+        end = position + 1
+        while end < len(self.visible) and self.visible[end].depth > node.depth:
+            end += 1
+        del self.visible[position + 1 : end]  # noqa: E203
+        node.expanded = False
+
+    def parent_position(self, position: int) -> Optional[int]:
+        depth = self.visible[position].depth
+        for above in range(position - 1, -1, -1):
+            if self.visible[above].depth < depth:
+                return above
+        return None
+
+    def _visible_descendants(self, node: _TreeNode) -> List[_TreeNode]:
+        descendants: List[_TreeNode] = []
+        for child in node.children or []:
+            descendants.append(child)
+            if child.expanded:
+                descendants.extend(self._visible_descendants(child))
+        return descendants
+
+
+@dataclass
+class Column:
+    """A column of the table `select` and `select_multiple` show rows in when given `columns`
+
+    Attributes:
+        title(str): Header of the column.
+        value(Callable[[Any], Any]): Returns the value of the column for a row.
+        formatter(Callable[[Any], str]): Turns the value into the text of the cell, which can contain rich markup. Defaults to `str`.
+        sort_key(Optional[Callable[[Any], Any]]): Turns the value into the key rows are sorted by. If None, the values
+        themselves are compared. Rows whose key is None come last in either direction, numbers of any type compare with
+        each other, other keys of different types are grouped by type, and keys which cannot be compared at all leave
+        the rows in their original order. Defaults to None.
+        align(str): Alignment of the cells within the column, either 'left' or 'right'. Defaults to 'left'.
+    """
+
+    title: str
+    value: Callable[[Any], Any]
+    formatter: Callable[[Any], str] = str
+    sort_key: Optional[Callable[[Any], Any]] = None
+    align: str = 'left'
+
+
+_TABLE_GAP = '  '
+
+
+def _kind_sort_key(key: Any) -> Tuple[int, str, Any]:
+    # Numbers compare with each other whatever their type, other keys only with keys of the same type
+    if isinstance(key, numbers.Real):
+        return (0, '', key)
+    return (1, type(key).__name__, key)
+
+
+# Tried in order until one compares all keys of a column, the last one leaves the rows in their original order
+_SORT_KEY_FALLBACKS: Tuple[Callable[[Any], Any], ...] = (lambda key: key, _kind_sort_key, lambda key: 0)
+
+
+class _Table:
+    """Rows of a select laid out in columns, used in place of the preprocessor.
+
+    Cells and sort keys of every loaded row are computed once, up front when the table is first shown or sorted, and of
+    rows loaded later as they arrive. Columns are as wide as the widest cell measured so far, so rows streaming in widen
+    them without formatting earlier rows again, and sorting only compares keys that were already computed.
+    """
+
+    widths: List[int]
+    sort_column: Optional[int]
+    descending: bool
+    _rows: Sequence
+    _columns: List[Column]
+    _indent: int
+    _cells: List[List[Tuple[str, int]]]
+    _sort_keys: List[List[Any]]
+    _fallback: int
+    # Indexes of all rows in the current sort order and how many of them have a key, they come before those without
+    _order: Optional[List[int]]
+    _present: int
+
+    def __init__(self, rows: Sequence, columns: List[Column], indent: int) -> None:
+        self._rows = rows
+        self._columns = columns
+        self._indent = indent
+        self._cells = []
+        self._sort_keys = [[] for _ in columns]
+        # Room for the sort marker shown after the title
+        self.widths = [_display_width(_plain_text(column.title)) + 2 for column in columns]
+        self.sort_column = None
+        self.descending = False
+        self._fallback = 0
+        self._order = None
+        self._present = 0
+
+    def __call__(self, index: int, row: Any) -> str:
+        self._measure()
+        return _TABLE_GAP.join(self._pad(text, width, i) for i, (text, width) in enumerate(self._cells[index])).rstrip(' ')
+
+    def header(self) -> str:
+        titles = []
+        for i, column in enumerate(self._columns):
+            marker = ('▼' if self.descending else '▲') if i == self.sort_column else ' '
+            titles.append(self._pad(f'{column.title} {marker}', _display_width(_plain_text(column.title)) + 2, i))
+        return '{}[bold]{}[/bold]'.format(' ' * self._indent, _TABLE_GAP.join(titles).rstrip(' '))
+
+    def cycle_sort(self) -> None:
+        """Sorts by the first column ascending, then descending, then by the next column, and so on, then not at all"""
+        if self.sort_column is None:
+            self.sort_column, self.descending = 0, False
+        elif not self.descending:
+            self.descending = True
+        elif self.sort_column + 1 < len(self._columns):
+            self.sort_column, self.descending = self.sort_column + 1, False
+        else:
+            self.sort_column = None
+        self._fallback = 0
+        self._order = None
+
+    def order(self, indexes: Optional[List[int]]) -> Optional[List[int]]:
+        """Returns `indexes`, or indexes of all rows if None, in the current sort order, None if rows are not sorted.
+
+        The order of all rows is kept until the sorting changes, rows which arrived since it was last asked for are merged
+        into it by their keys, so rows streaming in are not sorted again with all the others.
+        """
+        if self.sort_column is None:
+            return indexes
+        self._measure()
+        keys = self._sort_keys[self.sort_column]
+        if indexes is not None:
+            return self._sorted(keys, indexes)
+        if self._order is not None:
+            try:
+                for row in range(len(self._order), len(self._cells)):
+                    self._merge(self._order, keys, row)
+            except TypeError:
+                # The new key does not compare with the others, sort them all again with the next fallback
+                self._fallback += 1
+                self._order = None
+        if self._order is None:
+            self._order = self._sorted(keys, range(len(self._cells)))
+            self._present = sum(keys[i] is not None for i in self._order)
+        return self._order
+
+    def _sorted(self, keys: List[Any], rows: Sequence[int]) -> List[int]:
+        present = [i for i in rows if keys[i] is not None]
+        while True:
+            sort_key = _SORT_KEY_FALLBACKS[self._fallback]
+            try:
+                present.sort(key=keys.__getitem__ if self._fallback == 0 else lambda i: sort_key(keys[i]), reverse=self.descending)
+                break
+            except TypeError:
+                self._fallback += 1
+        # Rows without a key come last whichever way the column is sorted
+        return present + [i for i in rows if keys[i] is None]
+
+    def _merge(self, order: List[int], keys: List[Any], row: int) -> None:
+        if keys[row] is None:
+            order.append(row)
+            return
+        sort_key = _SORT_KEY_FALLBACKS[self._fallback]
+        key = sort_key(keys[row])
+        # Binary search for the position after the rows with an equal key, which is where a stable sort would put it
+        low, high = 0, self._present
+        while low < high:
+            middle = (low + high) // 2
+            other = sort_key(keys[order[middle]])
+            if (other < key) if self.descending else (key < other):
+                high = middle
+            else:
+                low = middle + 1
+        order.insert(low, row)
+        self._present += 1
+
+    def _measure(self) -> None:
+        for row in self._rows[len(self._cells) :]:  # noqa: E203
+            cells = []
+            for i, column in enumerate(self._columns):
+                value = column.value(row)
+                text = column.formatter(value)
+                width = _display_width(_plain_text(text))
+                cells.append((text, width))
+                self.widths[i] = max(self.widths[i], width)
+                self._sort_keys[i].append(value if column.sort_key is None else column.sort_key(value))
+            self._cells.append(cells)
+
+    def _pad(self, text: str, width: int, column: int) -> str:
+        padding = ' ' * (self.widths[column] - width)
+        return padding + text if self._columns[column].align == 'right' else text + padding
+
+
+def _plain_text(markup: str) -> str:
+    return Text.from_markup(markup).plain if '[' in markup else markup
+
+
+def _highlight_match(option: str, query: str, style: str = 'underline') -> str:
+    if not query or '[' in option:
+        # Positions of matched characters are not tracked through rich markup
+        return option
+    lowered = option.lower()
+    positions = set()
+    position = 0
+    for char in query.lower():
+        position = lowered.find(char, position)
+        if position < 0:
+            return option
+        positions.add(position)
+        position += 1
+    highlighted = ''.join(f'[{style}]{char}[/{style}]' if i in positions else char for i, char in enumerate(option))
+    return highlighted.replace(f'[/{style}][{style}]', '')
+
+
+def _index_preprocessor(preprocessor: Callable[[Any], str], cached: bool, maxsize: Optional[int] = None) -> IndexedPreprocessor:
+    if cached:
+        return _PreprocessorCache(preprocessor, maxsize)
+    return lambda _, option: preprocessor(option)
+
+
+def _to_key(key: Union[Key, Tuple[int, ...], str]) -> Key:
+    # Builds keys the way yakh reads them, elements expect e.g. an aborting key to tell its text and codes
+    if isinstance(key, Key):
+        return key
+    text, codes = (''.join(map(chr, key)), key) if isinstance(key, tuple) else (key, tuple(map(ord, key)))
+    return Key(text, codes, text.isprintable() or codes in [(13,), (27, 13)])
+
+
+def _is_printable(keypress: Union[Key, str]) -> bool:
+    if isinstance(keypress, Key):
+        return bool(keypress.is_printable)
+    return isinstance(keypress, str) and keypress.isprintable()
+
+
+_NO_ACTIONS: FrozenSet[str] = frozenset()
+
+
+class _Keymap:
+    """Key bindings compiled into a table from each bound key to the actions it triggers.
+
+    Bindings are compared the way `Key.__eq__` compares them, strings against the key's text and tuples against its key
+    codes, so a keypress resolves with at most two dictionary lookups however many keys are bound.
+    """
+
+    _table: Dict[Union[Tuple[int, ...], str], FrozenSet[str]]
+
+    def __init__(self, bindings: Dict[str, Iterable[Union[Tuple[int, ...], str]]]) -> None:
+        table: Dict[Union[Tuple[int, ...], str], Set[str]] = {}
+        for action, keys in bindings.items():
+            for key in keys:
+                table.setdefault(key, set()).add(action)
+        self._table = {key: frozenset(actions) for key, actions in table.items()}
+
+    def actions(self, keypress: Union[Key, Tuple[int, ...], str]) -> FrozenSet[str]:
+        if isinstance(keypress, Key):
+            by_codes = self._table.get(keypress.key_codes, _NO_ACTIONS)
+            by_text = self._table.get(keypress.key, _NO_ACTIONS)
+            return by_codes | by_text if by_codes and by_text else by_codes or by_text
+        return self._table.get(keypress, _NO_ACTIONS)
+
+
+def _input_pending() -> bool:
+    if msvcrt is not None and sys.platform in ('win32', 'cygwin'):
+        return bool(msvcrt.kbhit())
+    # yakh reads everything available on stdin at once and hands it out key by key, so the rest of a paste
+    # sits in its buffer of unconsumed characters
+    return bool(getattr(_yakh, '__unconsumed_chars', None))
+
+
+def _coalesce_keys(keys: List[Key]) -> List[Key]:
+    """Merges runs of typed characters, and everything inside bracketed paste, into single keys carrying the whole text"""
+    coalesced: List[Key] = []
+    text: List[str] = []
+    in_paste = False
+    for key in keys:
+        if key == _PASTE_START or key == _PASTE_END:
+            in_paste = key == _PASTE_START
             continue
+        key_text = key.key if isinstance(key, Key) and (key.is_printable or in_paste) else key if isinstance(key, str) else None
+        if key_text is not None and (in_paste or key_text.isprintable()):
+            text.extend(char for char in key_text if char.isprintable())
+            continue
+        if text:
+            coalesced.append(Key(''.join(text), tuple(map(ord, text)), is_printable=True))
+            text = []
+        coalesced.append(key)
+    if text:
+        coalesced.append(Key(''.join(text), tuple(map(ord, text)), is_printable=True))
+    return coalesced
+
+
+@contextmanager
+def _bracketed_paste(console: Console) -> Iterator:
+    if not console.is_terminal:
+        yield
+        return
+    console.file.write('\x1b[?2004h')
+    try:
+        yield
+    finally:
+        console.file.write('\x1b[?2004l')
+
 
-    return f'[{global_style_str}]{string_w_styles}[/{global_style_str}]'
+@lru_cache(maxsize=256)
+def _display_width(text: str) -> int:
+    # Emojis and East Asian wide characters occupy two cells; cursors and tick characters are measured on every row,
+    # so the scan is cached
+    if text.isascii():
+        return len(text)
+    return cell_len(text)
+
+
+def _render_option_select(i: int, cursor_index: int, option: str, cursor_style: str, cursor: str, query: str = '', padding: int = 0) -> str:
+    return '{}{}{}'.format(
+        f'[{cursor_style}]{cursor}[/{cursor_style}] ' if i == cursor_index else ' ' * (_display_width(cursor) + 1),
+        _highlight_match(option, query),
+        ' ' * padding,
+    )
+
+
+_STYLE_TAG = re.compile(r'\[(/?[^]]+)\]')
+
+
+@lru_cache(maxsize=1024)
+def _combine_style(style_string: str, global_style_str: str) -> Optional[str]:
+    try:
+        return str(Style.combine([Style.parse(style_string), Style.parse(global_style_str)]))
+    except Exception:
+        # In the case where there are non style defining square brakets in the string,
+        # ignores invalid colors in square brackets, since these aren't styles
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _wrap_style(string_w_styles: str, global_style_str: str) -> str:
+    def replace_tag(match: 're.Match[str]') -> str:
+        tag = match.group(1)
+        closing = tag.startswith('/')
+        style = _combine_style(tag[1:] if closing else tag, global_style_str)
+        if style is None or tag == '/':
+            return match.group(0)
+        return f'[/{style}]' if closing else f'[{style}]'
+
+    return f'[{global_style_str}]{_STYLE_TAG.sub(replace_tag, string_w_styles)}[/{global_style_str}]'
 
 
 def _render_option_select_multiple(
     option: str, ticked: bool, tick_character: str, tick_style: str, selected: bool, cursor_style: str
 ) -> str:
-    prefix = r'\[{}]'.format(' ' * len(_replace_emojis(tick_character)))
+    prefix = r'\[{}]'.format(' ' * _display_width(tick_character))
     if ticked:
         prefix = rf'\[[{tick_style}]{tick_character}[/{tick_style}]]'
     if selected:
@@ -71,14 +1327,14 @@ def _render_option_select_multiple(
     return f'{prefix} {option}'
 
 
-def _update_rendered(live: Live, renderable: Union[ConsoleRenderable, str]) -> None:
+def _update_rendered(live: LiveDisplay, renderable: Union[ConsoleRenderable, str]) -> None:
     live.update(renderable=renderable)
     live.refresh()
 
 
 def _render_prompt(secure: bool, state: qprompt.PromptState) -> str:
-    typed_values = [*(state.value or '')]
-    input_value = len(typed_values) * '*' if secure else ''.join(typed_values)
+    typed_value = state.value or ''
+    input_value = len(typed_value) * '*' if secure else typed_value
 
     # Escape backslashes to prevent them from being interpreted as escape characters
     cursor_position = state.cursor_position + input_value.count('\\')
@@ -105,52 +1361,126 @@ def _render_prompt(secure: bool, state: qprompt.PromptState) -> str:
     return render_value
 
 
-def _render_select(preprocessor: Callable[[Any], str], cursor_style: str, cursor: str, state: qselect.SelectState) -> str:
+def _visible_range(state: _SelectState) -> Tuple[int, int]:
+    if state.pagination:
+        show_from = (state.index // state.page_size) * state.page_size
+        return show_from, min(show_from + state.page_size, len(state.options))
+    if state.viewport_size is not None:
+        return state.viewport_offset, min(state.viewport_offset + state.viewport_size * state.columns, len(state.options))
+    return 0, len(state.options)
+
+
+def _scroll_viewport(state: _SelectState) -> None:
+    if state.viewport_size is None:
+        return
+    row, first_row = state.index // state.columns, state.viewport_offset // state.columns
+    if row < first_row:
+        first_row = row
+    elif row >= first_row + state.viewport_size:
+        first_row = row - state.viewport_size + 1
+    first_row = max(0, min(first_row, math.ceil(len(state.options) / state.columns) - state.viewport_size))
+    state.viewport_offset = first_row * state.columns
+
+
+def _prefetch_options(state: _SelectState, load_all: bool = False) -> None:
+    if not isinstance(state.options, _LazyOptions):
+        return
+    if load_all:
+        state.options.load_all()
+    else:
+        rows = state.page_size if state.pagination else (state.viewport_size or 0)
+        # Keep a screenful of options loaded past the visible ones so moving the cursor rarely waits for the source
+        state.options.load_until(max(state.index, state.viewport_offset) + 2 * rows * state.columns)
+
+
+def _render_select(preprocessor: IndexedPreprocessor, cursor_style: str, cursor: str, state: _SelectState) -> str:
     page: int = state.index // state.page_size + 1
     total_pages = math.ceil(len(state.options) / state.page_size)
 
-    show_from = (page - 1) * state.page_size
-    show_to = min(show_from + state.page_size, len(state.options))
+    show_from, show_to = _visible_range(state)
+
+    sources = [_source_index(state.options, i) for i in range(show_from, show_to)]
+    option_width = state.column_width - _display_width(cursor) - 1
+    cells = [
+        _render_option_select(
+            i=i,
+            cursor_index=state.index - show_from,
+            option=preprocessor(source, option),
+            cursor_style=cursor_style,
+            cursor=cursor,
+            query=state.filter,
+            padding=option_width - state.option_widths[source] if state.columns > 1 else 0,
+        )
+        for i, (source, option) in enumerate(zip(sources, state.options[show_from:show_to]))
+    ]
+    if state.columns > 1:
+        cells = [_GRID_GAP.join(cells[row : row + state.columns]).rstrip(' ') for row in range(0, len(cells), state.columns)]  # noqa: E203
+
+    return (  # noqa: ECE001
+        '\n'.join(cells)
+        + (f'[grey58]\n\nPage {page}/{total_pages}[/grey58]' if state.pagination and total_pages > 1 else '')  # noqa: W503
+        + (f'\n[grey58]Filter: {escape(state.filter)}[/grey58]' if state.filter else '')  # noqa: W503
+        + '\n\n([bold]enter[/bold] to confirm)'  # noqa: W503
+    )
+
+
+def _render_select_grid(layout: _GridLayout, render: Callable[[_SelectState], str], state: _SelectState) -> str:
+    # Arranging on every frame picks up a resized terminal with the next redraw, otherwise it only compares two widths
+    layout.arrange(state)
+    return render(state)
+
+
+def _render_tree_node(preprocessor: Callable[[Any], str], node: _TreeNode) -> str:
+    if node.label is None:
+        node.label = preprocessor(node.value)
+    marker = ('▾' if node.expanded else '▸') if node.has_children else ' '
+    return f'{"  " * node.depth}{marker} {node.label}'
+
+
+def _render_select_tree(preprocessor: Callable[[Any], str], cursor_style: str, cursor: str, state: _SelectState) -> str:
+    show_from, show_to = _visible_range(state)
 
     return (  # noqa: ECE001
         '\n'.join(
             [
                 _render_option_select(
                     i=i,
-                    cursor_index=state.index % state.page_size if state.pagination else state.index,
-                    option=preprocessor(option),
+                    cursor_index=state.index - show_from,
+                    option=_render_tree_node(preprocessor, node),
                     cursor_style=cursor_style,
                     cursor=cursor,
                 )
-                for i, option in enumerate(state.options[show_from:show_to] if state.pagination else state.options)
+                for i, node in enumerate(state.options[show_from:show_to])
             ]
         )
-        + (f'[grey58]\n\nPage {page}/{total_pages}[/grey58]' if state.pagination and total_pages > 1 else '')  # noqa: W503
-        + '\n\n([bold]enter[/bold] to confirm)'  # noqa: W503
+        + '\n\n([bold]→[/bold]/[bold]←[/bold] to expand/collapse, [bold]enter[/bold] to confirm)'  # noqa: W503
     )
 
 
+def _render_select_table(table: _Table, render: Callable[[_SelectState], str], state: _SelectState) -> str:
+    return f'{table.header()}\n{render(state)}'
+
+
 def _render_select_multiple(
-    preprocessor: Callable[[Any], str], tick_character: str, tick_style: str, cursor_style: str, state: qselect.SelectState
+    preprocessor: IndexedPreprocessor, tick_character: str, tick_style: str, cursor_style: str, state: _SelectState
 ) -> str:
     page: int = state.index // state.page_size + 1
     total_pages = math.ceil(len(state.options) / state.page_size)
 
-    show_from = (page - 1) * state.page_size
-    show_to = min(show_from + state.page_size, len(state.options))
+    show_from, show_to = _visible_range(state)
 
     rendered = (  # noqa: ECE001
         '\n'.join(
             [
                 _render_option_select_multiple(
-                    option=preprocessor(option),
-                    ticked=(i + show_from in state.selected_indexes) if state.pagination else (i in state.selected_indexes),
+                    option=preprocessor(_source_index(state.options, i + show_from), option),
+                    ticked=_source_index(state.options, i + show_from) in state.selected_indexes,
                     tick_character=tick_character,
                     tick_style=tick_style,
-                    selected=i == (state.index % state.page_size if state.pagination else state.index),
+                    selected=i + show_from == state.index,
                     cursor_style=cursor_style,
                 )
-                for i, option in enumerate(state.options[show_from:show_to] if state.pagination else state.options)
+                for i, option in enumerate(state.options[show_from:show_to])
             ]
         )
         + (f'[grey58]\n\nPage {page}/{total_pages}[/grey58]' if state.pagination and total_pages > 1 else '')  # noqa: W503
@@ -208,9 +1538,13 @@ def _paginate_back(page: int, total_pages: int) -> int:
     return page
 
 
-def _prompt_key_handler(prompt_state: qprompt.PromptState, keypress: Key) -> qprompt.PromptState:
+def _prompt_key_handler(prompt_state: _PromptState, keypress: Key) -> _PromptState:
     s = copy.deepcopy(prompt_state)
+    _handle_prompt_key(s, keypress)
+    return s
 
+
+def _handle_prompt_key(s: _PromptState, keypress: Key) -> None:
     if keypress == Keys.TAB:
         if s.completion.in_completion_ctx and s.completion.options:
             s.completion.index, s.cursor_position, s.value = _completions_options_step(s)
@@ -218,7 +1552,7 @@ def _prompt_key_handler(prompt_state: qprompt.PromptState, keypress: Key) -> qpr
             s.completion.in_completion_ctx = True
             s.completion.index = 0
             s.value = s.completion.options[0] if s.completion.options else s.value
-            s.cursor_position = len(s.value)
+            s.cursor_position = len(s.buffer)
     else:
         s.completion.in_completion_ctx = False
         s.completion.options = []
@@ -233,35 +1567,27 @@ def _prompt_key_handler(prompt_state: qprompt.PromptState, keypress: Key) -> qpr
         if s.cursor_position > 0:
             s.cursor_position -= 1
     elif keypress == Keys.RIGHT_ARROW:
-        if s.cursor_position < len(s.value):
+        if s.cursor_position < len(s.buffer):
             s.cursor_position += 1
     elif keypress == Keys.HOME:
         s.cursor_position = 0
     elif keypress == Keys.END:
-        s.cursor_position = len(s.value)
+        s.cursor_position = len(s.buffer)
     elif keypress == Keys.DELETE:
-        if s.cursor_position < len(s.value):
-            value_chars = [*s.value]
-            del value_chars[s.cursor_position]
-            s.value = ''.join(value_chars)
+        if s.cursor_position < len(s.buffer):
+            s.buffer.delete(s.cursor_position)
     elif keypress == Keys.BACKSPACE:
         if s.cursor_position > 0:
             s.cursor_position -= 1
-            value_chars = [*s.value]
-            del value_chars[s.cursor_position]
-            s.value = ''.join(value_chars)
+            s.buffer.delete(s.cursor_position)
     elif keypress == Keys.ESC:
         s.exit = True
     elif keypress == Keys.UP_ARROW or keypress == Keys.DOWN_ARROW:
         pass
     elif keypress:
         if not (keypress == Keys.TAB and s.completion.in_completion_ctx):
-            value_chars = [*s.value]
-            value_chars.insert(s.cursor_position, str(keypress))
-            s.cursor_position += 1
-            s.value = ''.join(value_chars)
-
-    return s
+            s.buffer.insert(s.cursor_position, str(keypress))
+            s.cursor_position += len(str(keypress))
 
 
 def _completions_options_step(state: qprompt.PromptState) -> Tuple[int, int, str]:
@@ -0,0 +1,7 @@
+from beaupy.aio._aio import (  # noqa
+    confirm,
+    prompt,
+    select,
+    select_multiple,
+    select_tree,
+)
@@ -0,0 +1,405 @@
+import asyncio
+import codecs
+import concurrent.futures
+import os
+import re
+import sys
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Deque,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+    cast,
+)
+
+import yakh
+from yakh.key import Key
+
+from beaupy import _beaupy
+from beaupy._beaupy import Input, Result, T
+from beaupy._internals import (
+    _PASTE_END,
+    _PASTE_START,
+    Column,
+    OptionFeed,
+    TargetType,
+    _coalesce_keys,
+    _to_key,
+)
+
+try:
+    import termios
+except ImportError:
+    termios = None  # type: ignore
+
+# Same splitting as yakh, escape sequences are a single key, everything else a key per character
+_ANSI_CODE = re.compile(r'\x1B[@-_][0-?]*[ -/]*[@-~]')
+
+
+def _split_keys(text: str) -> List[str]:
+    keys: List[str] = []
+    position = 0
+    for match in _ANSI_CODE.finditer(text):
+        keys.extend(text[position : match.start()])  # noqa: E203
+        keys.append(match.group())
+        position = match.end()
+    keys.extend(text[position:])
+    return keys
+
+
+class _TerminalKeyReader:
+    """Reads keys from a terminal through the event loop's reader, so waiting for them never blocks the loop.
+
+    For the reader's lifetime the terminal delivers input byte by byte without echo and without turning ctrl+c into a
+    signal, like yakh does while it reads. Output processing is left on, so the elements draw as usual.
+    """
+
+    _fd: int
+    _keys: Deque[Key]
+    _arrived: asyncio.Event
+    _eof: bool
+
+    def __init__(self, fd: int) -> None:
+        self._fd = fd
+        self._keys = deque()
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._eof = False
+        self._saved_mode: Optional[List[Any]] = None
+
+    async def __aenter__(self) -> '_TerminalKeyReader':
+        self._arrived = asyncio.Event()
+        self._saved_mode = termios.tcgetattr(self._fd)
+        mode = termios.tcgetattr(self._fd)
+        mode[0] &= ~(termios.BRKINT | termios.ICRNL | termios.INPCK | termios.ISTRIP | termios.IXON)
+        mode[3] &= ~(termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG)
+        mode[6][termios.VMIN] = 1
+        mode[6][termios.VTIME] = 0
+        # Switching right away keeps whatever was typed before the element showed up
+        termios.tcsetattr(self._fd, termios.TCSANOW, mode)
+        self._keys.extend(_beaupy._unread_keys)
+        _beaupy._unread_keys.clear()
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        asyncio.get_running_loop().remove_reader(self._fd)
+        # Keys the element did not read are left for the next one, whichever way it reads them
+        _beaupy._unread_keys.extend(self._keys)
+        self._keys.clear()
+        if self._saved_mode is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_mode)
+
+    def _on_readable(self) -> None:
+        data = os.read(self._fd, 4096)
+        if not data:
+            self._eof = True
+            asyncio.get_running_loop().remove_reader(self._fd)
+        self._keys.extend(map(_to_key, _split_keys(self._decoder.decode(data, final=not data))))
+        self._arrived.set()
+
+    async def read_key(self) -> Key:
+        while not self._keys:
+            if self._eof:
+                raise EOFError('The terminal input was closed')
+            self._arrived.clear()
+            await self._arrived.wait()
+        return self._keys.popleft()
+
+    async def read_keys(self) -> List[Key]:
+        """Waits for a key, then also takes the text already waiting, up to the first other key or the whole paste"""
+        keys = [await self.read_key()]
+        in_paste = keys[0] == _PASTE_START
+        while in_paste or (_beaupy._is_text(keys[-1]) and self._keys):
+            keys.append(await self.read_key())
+            if keys[-1] == _PASTE_START or keys[-1] == _PASTE_END:
+                in_paste = keys[-1] == _PASTE_START
+        return _coalesce_keys(keys)
+
+
+def _read_on_thread(read: Callable[[], List[Key]]) -> 'concurrent.futures.Future[List[Key]]':
+    # A daemon thread rather than an executor, which would wait for a read nobody needs any more when shutting down
+    future: 'concurrent.futures.Future[List[Key]]' = concurrent.futures.Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            future.set_result(read())
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class _ExecutorKeyReader:
+    """Reads keys with beaupy's blocking readers on a worker thread.
+
+    Used where the event loop cannot watch the input, on Windows or when stdin is not a terminal, and when `get_key`
+    has been substituted, e.g. by a HeadlessSession. Blocking reads cannot be interrupted, so a read whose element is
+    cancelled keeps waiting on its thread, and the next element reading keys this way takes over the read instead of
+    starting another one, which would race it for the next key.
+    """
+
+    # Shared by all readers, it is only cleared once its keys were handed to an element
+    _read: ClassVar[Optional['concurrent.futures.Future[List[Key]]']] = None
+
+    async def __aenter__(self) -> '_ExecutorKeyReader':
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        pass
+
+    async def read_key(self) -> Key:
+        keys = await self._keys(lambda: [_beaupy._read_key()])
+        # A read taken over from a prompt may have returned more than one key
+        _beaupy._unread_keys.extendleft(reversed(keys[1:]))
+        return keys[0]
+
+    async def read_keys(self) -> List[Key]:
+        return await self._keys(_beaupy._read_keys)
+
+    async def _keys(self, read: Callable[[], List[Key]]) -> List[Key]:
+        if _ExecutorKeyReader._read is None:
+            _ExecutorKeyReader._read = _read_on_thread(read)
+        keys = asyncio.wrap_future(_ExecutorKeyReader._read)
+        try:
+            return await keys
+        finally:
+            if not keys.cancelled():
+                _ExecutorKeyReader._read = None
+
+
+def _key_reader() -> Union[_TerminalKeyReader, _ExecutorKeyReader]:
+    if termios is not None and _beaupy.get_key is yakh.get_key and sys.stdin.isatty():
+        return _TerminalKeyReader(sys.stdin.fileno())
+    return _ExecutorKeyReader()
+
+
+async def _drive(flow: Generator[None, Input, Result], read: Callable[[], Awaitable[Input]]) -> Result:
+    try:
+        next(flow)
+        while True:
+            flow.send(await read())
+    except StopIteration as finished:
+        return cast(Result, finished.value)
+    finally:
+        flow.close()
+
+
+@asynccontextmanager
+async def _fed_options(options: Any) -> AsyncIterator[Any]:
+    """Turns an async iterable into an OptionFeed filled by a task for as long as the element is displayed"""
+    if not isinstance(options, AsyncIterable):
+        yield options
+        return
+
+    feed = OptionFeed()
+
+    async def pump() -> None:
+        async for option in options:
+            feed.append(option)
+
+    task = asyncio.ensure_future(pump())
+    try:
+        yield feed
+    finally:
+        task.cancel()
+
+
+async def prompt(
+    prompt: str,
+    target_type: Type[TargetType] = str,
+    validator: Callable[[TargetType], bool] = lambda input: True,
+    secure: bool = False,
+    raise_validation_fail: bool = True,
+    raise_type_conversion_fail: bool = True,
+    initial_value: Optional[str] = None,
+    completion: Optional[Callable[[str], List[str]]] = None,
+) -> TargetType:
+    """Awaitable version of `beaupy.prompt`, the event loop keeps running while waiting for keys.
+
+    Arguments, exceptions and the return value are the same as for `beaupy.prompt`. Cancelling the awaiting task
+    closes the prompt and restores the terminal.
+    """
+    async with _key_reader() as reader:
+        return await _drive(
+            _beaupy._prompt(
+                prompt=prompt,
+                target_type=target_type,
+                validator=validator,
+                secure=secure,
+                raise_validation_fail=raise_validation_fail,
+                raise_type_conversion_fail=raise_type_conversion_fail,
+                initial_value=initial_value,
+                completion=completion,
+            ),
+            reader.read_keys,
+        )
+
+
+async def select(
+    options: Union[List[Union[str, T]], Iterable[Union[str, T]], AsyncIterable[Union[str, T]]],
+    preprocessor: Callable[[T], str] = lambda val: str(val),
+    cursor: str = '>',
+    cursor_style: str = 'pink1',
+    cursor_index: int = 0,
+    return_index: bool = False,
+    strict: bool = False,
+    pagination: bool = False,
+    page_size: int = 5,
+    cache_preprocessed: bool = True,
+    filterable: bool = False,
+    type_ahead: bool = False,
+    grid: bool = False,
+    columns: Optional[List[Column]] = None,
+) -> Union[int, Any, None]:
+    """Awaitable version of `beaupy.select`, the event loop keeps running while waiting for keys.
+
+    Arguments, exceptions and the return value are the same as for `beaupy.select`, except that `options` may also be
+    an async iterable, whose options are added while the select is displayed, like with an OptionFeed. Cancelling the
+    awaiting task closes the select and restores the terminal.
+    """
+    async with _key_reader() as reader, _fed_options(options) as fed_options:
+        return await _drive(
+            _beaupy._select(
+                options=fed_options,
+                preprocessor=preprocessor,
+                cursor=cursor,
+                cursor_style=cursor_style,
+                cursor_index=cursor_index,
+                return_index=return_index,
+                strict=strict,
+                pagination=pagination,
+                page_size=page_size,
+                cache_preprocessed=cache_preprocessed,
+                filterable=filterable,
+                type_ahead=type_ahead,
+                grid=grid,
+                columns=columns,
+            ),
+            reader.read_key,
+        )
+
+
+async def select_multiple(
+    options: Union[List[Union[str, T]], Iterable[Union[str, T]], AsyncIterable[Union[str, T]]],
+    preprocessor: Callable[[T], str] = lambda val: str(val),
+    tick_character: str = '✓',
+    tick_style: str = 'pink1',
+    cursor_style: str = 'pink1',
+    ticked_indices: Optional[List[int]] = None,
+    cursor_index: int = 0,
+    minimal_count: int = 0,
+    maximal_count: Optional[int] = None,
+    return_indices: bool = False,
+    strict: bool = False,
+    pagination: bool = False,
+    page_size: int = 5,
+    cache_preprocessed: bool = True,
+    type_ahead: bool = False,
+    columns: Optional[List[Column]] = None,
+) -> List[Union[int, Any]]:
+    """Awaitable version of `beaupy.select_multiple`, the event loop keeps running while waiting for keys.
+
+    Arguments, exceptions and the return value are the same as for `beaupy.select_multiple`, except that `options` may
+    also be an async iterable, whose options are added while the select is displayed, like with an OptionFeed.
+    Cancelling the awaiting task closes the select and restores the terminal.
+    """
+    async with _key_reader() as reader, _fed_options(options) as fed_options:
+        return await _drive(
+            _beaupy._select_multiple(
+                options=fed_options,
+                preprocessor=preprocessor,
+                tick_character=tick_character,
+                tick_style=tick_style,
+                cursor_style=cursor_style,
+                ticked_indices=ticked_indices,
+                cursor_index=cursor_index,
+                minimal_count=minimal_count,
+                maximal_count=maximal_count,
+                return_indices=return_indices,
+                strict=strict,
+                pagination=pagination,
+                page_size=page_size,
+                cache_preprocessed=cache_preprocessed,
+                type_ahead=type_ahead,
+                columns=columns,
+            ),
+            reader.read_key,
+        )
+
+
+async def select_tree(
+    roots: Iterable[T],
+    children: Callable[[T], Iterable[T]],
+    has_children: Callable[[T], bool] = lambda node: True,
+    preprocessor: Callable[[T], str] = lambda val: str(val),
+    cursor: str = '>',
+    cursor_style: str = 'pink1',
+    return_path: bool = False,
+    strict: bool = False,
+) -> Union[T, List[T], None]:
+    """Awaitable version of `beaupy.select_tree`, the event loop keeps running while waiting for keys.
+
+    Arguments, exceptions and the return value are the same as for `beaupy.select_tree`. `children` is called on the event
+    loop, so it should return quickly. Cancelling the awaiting task closes the select and restores the terminal.
+    """
+    async with _key_reader() as reader:
+        return await _drive(
+            _beaupy._select_tree(
+                roots=roots,
+                children=children,
+                has_children=has_children,
+                preprocessor=preprocessor,
+                cursor=cursor,
+                cursor_style=cursor_style,
+                return_path=return_path,
+                strict=strict,
+            ),
+            reader.read_key,
+        )
+
+
+async def confirm(
+    question: str,
+    yes_text: str = 'Yes',
+    no_text: str = 'No',
+    has_to_match_case: bool = False,
+    enter_empty_confirms: bool = True,
+    default_is_yes: bool = False,
+    cursor: str = '>',
+    cursor_style: str = 'pink1',
+    char_prompt: bool = True,
+) -> Optional[bool]:
+    """Awaitable version of `beaupy.confirm`, the event loop keeps running while waiting for keys.
+
+    Arguments, exceptions and the return value are the same as for `beaupy.confirm`. Cancelling the awaiting task
+    closes the confirm and restores the terminal.
+    """
+    async with _key_reader() as reader:
+        return await _drive(
+            _beaupy._confirm(
+                question=question,
+                yes_text=yes_text,
+                no_text=no_text,
+                has_to_match_case=has_to_match_case,
+                enter_empty_confirms=enter_empty_confirms,
+                default_is_yes=default_is_yes,
+                cursor=cursor,
+                cursor_style=cursor_style,
+                char_prompt=char_prompt,
+            ),
+            reader.read_keys,
+        )
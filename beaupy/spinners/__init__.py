@@ -10,4 +10,6 @@ from beaupy.spinners._spinners import (  # noqa
     LOADING,
     MOON,
     Spinner,
+    SpinnerGroup,
+    SpinnerTask,
 )
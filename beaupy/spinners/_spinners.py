@@ -1,7 +1,10 @@
-from itertools import cycle
-from typing import List
+import threading
+import time
+from typing import Any, List, Optional, Tuple
 
+from rich.console import Group
 from rich.live import Live
+from rich.text import Text
 
 ARC = ['◜', '◠', '◝', '◞', '◡', '◟']
 ARROWS = ['←', '↖', '↑', '↗', '→', '↘', '↓', '↙']
@@ -15,15 +18,91 @@ LOADING = ['l      ', 'lo     ', 'loa    ', 'load   ', 'loadi  ', 'loadin ', 'lo
 MOON = ['🌑', '🌒', '🌓', '🌔', '🌕', '🌖', '🌗', '🌘']
 
 
+class _SpinnerTicker:
+    """Animates every running spinner from a single thread, drawing them together into one live region.
+
+    The region is created when the first spinner starts and removed when the last one stops. It is refreshed as often
+    as the fastest running spinner asks for, each spinner picks its frame from the time it has been running, so a tick
+    costs one terminal write no matter how many spinners there are.
+    """
+
+    _lock: threading.Lock
+    _spinners: List['Spinner']
+    _live_display: Optional[Live]
+    _thread: Optional[threading.Thread]
+    _stopped: threading.Event
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spinners = []
+        self._live_display = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def add(self, spinner: 'Spinner') -> None:
+        with self._lock:
+            if spinner in self._spinners:
+                return
+            self._spinners.append(spinner)
+            if self._live_display is None:
+                self._live_display = Live('', transient=True, auto_refresh=False, get_renderable=self._render)
+                self._live_display.start()
+                self._stopped = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stopped,), name='beaupy-spinners', daemon=True)
+                self._thread.start()
+            self._live_display.refresh()
+
+    def remove(self, spinner: 'Spinner') -> None:
+        thread = None
+        with self._lock:
+            if spinner not in self._spinners or self._live_display is None:
+                return
+            self._spinners.remove(spinner)
+            if not spinner._transient:
+                # Printed above the region, so the last frame stays in place after the region is removed
+                self._live_display.console.print(spinner._frame_at(time.monotonic()))
+            if self._spinners:
+                self._live_display.refresh()
+            else:
+                self._stopped.set()
+                self._live_display.stop()
+                self._live_display = None
+                thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _render(self) -> Group:
+        now = time.monotonic()
+        return Group(*[spinner._frame_at(now) for spinner in list(self._spinners)])
+
+    def _run(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._interval()):
+            with self._lock:
+                if self._live_display is not None:
+                    self._live_display.refresh()
+
+    def _interval(self) -> float:
+        spinners = list(self._spinners)
+        return 1 / max([spinner._refresh_per_second for spinner in spinners], default=10)
+
+
+_ticker = _SpinnerTicker()
+
+
 class Spinner:
-    _spinner_characters: cycle
-    _live_display: Live
+    _frames: List[Text]
+    _refresh_per_second: float
+    _transient: bool
+    _started: float
 
     def __init__(
         self, spinner_characters: List[str] = DOTS, text: str = 'Loading...', refresh_per_second: float = 10, transient: bool = True
     ):
         """Creates a spinner which can be used to provide some user feedback during long processing
 
+        All running spinners are animated by one shared thread and drawn together, one line each, so that several of
+        them can run at once.
+
         Args:
             spinner_characters (List[str]): List of strings that will be displayed in sequence by a spinner
             text (str): Static text that will be shown after the spinner. Defaults to `Loading...`
@@ -36,18 +115,133 @@ class Spinner:
         """
         if len(spinner_characters) == 0:
             raise ValueError('`spinner_characters` can\'t be empty')
-        self._spinner_characters = cycle(spinner_characters)
-        self._live_display = Live(
-            '',
-            transient=transient,
-            refresh_per_second=refresh_per_second,
-            get_renderable=lambda: f'{next(self._spinner_characters)} {text}',
-        )
+        # Frames are parsed once, every tick only picks one of them
+        self._frames = [Text.from_markup(f'{character} {text}') for character in spinner_characters]
+        self._refresh_per_second = refresh_per_second
+        self._transient = transient
+        self._started = time.monotonic()
+
+    def _frame_at(self, now: float) -> Text:
+        return self._frames[int((now - self._started) * self._refresh_per_second) % len(self._frames)]
 
     def start(self) -> None:
         """Starts the spinner"""
-        self._live_display.start()
+        self._started = time.monotonic()
+        _ticker.add(self)
 
     def stop(self) -> None:
         """Stops the spinner"""
-        self._live_display.stop()
+        _ticker.remove(self)
+
+
+class SpinnerTask:
+    """A line of a SpinnerGroup, showing the status of one task.
+
+    Its methods may be called from any thread. They only replace the task's state, which the group's next tick draws,
+    so workers never wait on the terminal or on each other.
+    """
+
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    _state: Tuple[str, str]
+    _parsed_state: Optional[Tuple[str, str]]
+    _parsed_text: Text
+
+    def __init__(self, text: str) -> None:
+        self._state = (self.RUNNING, text)
+        self._parsed_state = None
+        self._parsed_text = Text()
+
+    @property
+    def status(self) -> str:
+        return self._state[0]
+
+    @property
+    def text(self) -> str:
+        return self._state[1]
+
+    def update(self, text: str) -> None:
+        """Replaces the text shown after the spinner"""
+        self._state = (self._state[0], text)
+
+    def done(self, text: Optional[str] = None) -> None:
+        """Marks the task as finished, optionally replacing its text"""
+        self._state = (self.DONE, self.text if text is None else text)
+
+    def fail(self, text: Optional[str] = None) -> None:
+        """Marks the task as failed, optionally replacing its text"""
+        self._state = (self.FAILED, self.text if text is None else text)
+
+    def _line(self, spinner: Text, done: Text, failed: Text) -> Text:
+        state = self._state
+        if state is not self._parsed_state:
+            self._parsed_text = Text.from_markup(state[1])
+            self._parsed_state = state
+        marker = {self.RUNNING: spinner, self.DONE: done, self.FAILED: failed}[state[0]]
+        return Text.assemble(marker, ' ', self._parsed_text)
+
+
+class SpinnerGroup(Spinner):
+    _characters: List[Text]
+    _done: Text
+    _failed: Text
+    _tasks: List[SpinnerTask]
+
+    def __init__(
+        self,
+        spinner_characters: List[str] = DOTS,
+        refresh_per_second: float = 10,
+        transient: bool = True,
+        done_character: str = '[green]✓[/green]',
+        failed_character: str = '[red]✗[/red]',
+    ):
+        """Creates a group of spinners, one line per task, for work fanned out over threads or processes
+
+        Workers report through the `SpinnerTask` returned by `add`. However many tasks there are and however often
+        they report, the group is drawn once per tick.
+
+        Args:
+            spinner_characters (List[str]): List of strings that will be displayed in sequence by running tasks
+            refresh_per_second (float, optional): Number of refreshes the group will do a second. Defaults to 10.
+            transient (bool, optional): If the group will disappear after it's done, otherwise not. Defaults to True.
+            done_character (str, optional): Shown instead of the spinner by finished tasks. Defaults to a green `✓`.
+            failed_character (str, optional): Shown instead of the spinner by failed tasks. Defaults to a red `✗`.
+
+        Raises:
+            ValueError: Raised when no `spinner_characters` are provided in
+        """
+        super().__init__(spinner_characters, '', refresh_per_second, transient)
+        self._characters = [Text.from_markup(character) for character in spinner_characters]
+        self._done = Text.from_markup(done_character)
+        self._failed = Text.from_markup(failed_character)
+        self._tasks = []
+
+    def add(self, text: str) -> SpinnerTask:
+        """Adds a running task to the group, safe to call from any thread
+
+        Args:
+            text (str): Text shown after the task's spinner
+
+        Returns:
+            SpinnerTask: Handle to update the task with
+        """
+        task = SpinnerTask(text)
+        self._tasks.append(task)
+        return task
+
+    @property
+    def tasks(self) -> List[SpinnerTask]:
+        return list(self._tasks)
+
+    def __enter__(self) -> 'SpinnerGroup':
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def _frame_at(self, now: float) -> Text:
+        spinner = self._characters[int((now - self._started) * self._refresh_per_second) % len(self._characters)]
+        return Text('\n').join([task._line(spinner, self._done, self._failed) for task in list(self._tasks)])
@@ -0,0 +1,123 @@
+from functools import lru_cache, partial
+from itertools import cycle, islice
+from typing import Any, Callable, List
+
+import pytest
+from yakh.key import Keys
+
+from beaupy._beaupy import _keymap, _navigate_select, _navigate_select_multiple, _sort_select
+from beaupy._internals import (
+    Column,
+    _index_preprocessor,
+    _prompt_key_handler,
+    _PromptState,
+    _render_prompt,
+    _render_select,
+    _render_select_multiple,
+    _render_select_table,
+    _SelectState,
+    _Table,
+)
+
+OPTION_COUNTS = [10, 1_000, 100_000, 1_000_000]
+PROMPT_LENGTHS = [10, 1_000, 100_000]
+VIEWPORT_SIZE = 20
+
+
+@lru_cache(maxsize=None)
+def _options(count: int) -> List[str]:
+    return [f'Option [bold]{i}[/bold]' for i in range(count)]
+
+
+def _key_stream(pattern: List[Any], length: int = 500) -> List[Any]:
+    return list(islice(cycle(pattern), length))
+
+
+def _select_state(count: int, pagination: bool) -> _SelectState:
+    return _SelectState(
+        options=_options(count),
+        index=0,
+        page_size=10,
+        pagination=pagination,
+        viewport_size=None if pagination else VIEWPORT_SIZE,
+    )
+
+
+NAVIGATION = [Keys.DOWN_ARROW] * 40 + [Keys.END] + [Keys.UP_ARROW] * 40 + [Keys.HOME]
+PAGINATION = [Keys.RIGHT_ARROW] * 5 + [Keys.DOWN_ARROW] * 5 + [Keys.LEFT_ARROW] * 5
+TICKING = [' ', Keys.DOWN_ARROW, ' ', Keys.DOWN_ARROW, ' ', Keys.UP_ARROW] * 10 + ['a', 'a']
+
+
+@pytest.mark.parametrize('count', OPTION_COUNTS)
+@pytest.mark.parametrize('pagination', [False, True], ids=['viewport', 'paginated'])
+def test_select_keypress(benchmark: Callable, count: int, pagination: bool) -> None:
+    def setup() -> Callable[[Any], str]:
+        state = _select_state(count, pagination)
+        renderer = partial(_render_select, _index_preprocessor(str, cached=True), 'pink1', '>')
+        keymap = _keymap()
+
+        def handle_key(keypress: Any) -> str:
+            return renderer(_navigate_select(state, keymap.actions(keypress)))
+
+        return handle_key
+
+    benchmark(setup, _key_stream(PAGINATION if pagination else NAVIGATION))
+
+
+@pytest.mark.parametrize('count', OPTION_COUNTS)
+def test_select_multiple_keypress(benchmark: Callable, count: int) -> None:
+    def setup() -> Callable[[Any], str]:
+        state = _select_state(count, pagination=False)
+        renderer = partial(_render_select_multiple, _index_preprocessor(str, cached=True), '✓', 'pink1', 'pink1')
+        keymap = _keymap()
+
+        def handle_key(keypress: Any) -> str:
+            return renderer(_navigate_select_multiple(state, keypress, keymap.actions(keypress), minimal_count=0, maximal_count=None))
+
+        return handle_key
+
+    benchmark(setup, _key_stream(TICKING))
+
+
+@lru_cache(maxsize=None)
+def _rows(count: int) -> List[tuple]:
+    return [(f'host-{i:07}', (i * 7919) % 1000 / 10, ('eu', 'us', 'ap')[i % 3]) for i in range(count)]
+
+
+@pytest.mark.parametrize('count', OPTION_COUNTS[:3])
+def test_table_sort_keypress(benchmark: Callable, count: int) -> None:
+    columns = [Column('Host', lambda row: row[0]), Column('CPU', lambda row: row[1], align='right'), Column('Region', lambda row: row[2])]
+
+    def setup() -> Callable[[Any], str]:
+        rows = _rows(count)
+        table = _Table(rows, columns, indent=2)
+        state = _SelectState(options=rows, index=0, viewport_size=VIEWPORT_SIZE)
+        renderer = partial(_render_select_table, table, partial(_render_select, table, 'pink1', '>'))
+        keymap = _keymap()
+
+        def handle_key(keypress: Any) -> str:
+            nonlocal state
+            actions = keymap.actions(keypress)
+            state = _sort_select(state, table, rows) if 'tab' in actions else _navigate_select(state, actions)
+            return renderer(state)
+
+        return handle_key
+
+    benchmark(setup, _key_stream([Keys.TAB, Keys.DOWN_ARROW, Keys.DOWN_ARROW], length=70))
+
+
+@pytest.mark.parametrize('length', PROMPT_LENGTHS)
+def test_prompt_keypress(benchmark: Callable, length: int) -> None:
+    typing = list('hello world') + [Keys.LEFT_ARROW] * 3 + [Keys.BACKSPACE, Keys.DELETE] + [Keys.RIGHT_ARROW] * 3
+
+    def setup() -> Callable[[Any], str]:
+        state = _PromptState(title='Benchmark', value='x' * length, cursor_position=length)
+
+        def handle_key(keypress: Any) -> str:
+            nonlocal state
+            state = _prompt_key_handler(state, keypress)
+            return _render_prompt(False, state)
+
+        return handle_key
+
+    benchmark(setup, _key_stream(typing, length=200))
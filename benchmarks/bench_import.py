@@ -0,0 +1,20 @@
+import subprocess
+import sys
+import time
+
+RUNS = 5
+
+
+def _startup(code: str) -> float:
+    # The fastest of several runs, as interpreter startup is noisy
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_import_beaupy_startup_time() -> None:
+    # Generous bound so the check only trips when heavy imports creep back into `import beaupy`
+    assert _startup('import beaupy') - _startup('pass') < 0.1
@@ -0,0 +1,139 @@
+"""Harness for the key-stream benchmarks in this directory.
+
+Run them with `poe benchmark`. Apart from the import time check in `bench_import.py`, every benchmark feeds a stream
+of synthetic keypresses to a handler and reports per-keypress latency and memory allocated while handling it.
+Results can be saved with `--bench-save` and later runs checked against them with `--bench-compare`, failing any
+benchmark whose median latency regressed by more than `--bench-tolerance`.
+"""
+
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pytest
+
+KeyHandler = Callable[[Any], Any]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('beaupy benchmarks')
+    group.addoption('--bench-save', metavar='PATH', help='Write benchmark results to PATH as JSON')
+    group.addoption('--bench-compare', metavar='PATH', help='Fail benchmarks slower than the results saved in PATH')
+    group.addoption('--bench-tolerance', type=float, default=1.5, help='Allowed median slowdown when comparing. Defaults to 1.5')
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    keypresses: int
+    median_us: float
+    p95_us: float
+    max_us: float
+    allocated_kib_per_key: float
+    retained_kib: float
+
+
+class KeyStreamBenchmark:
+    def __init__(self, name: str, baseline: Optional[Dict[str, Any]], tolerance: float, results: List[BenchmarkResult]) -> None:
+        self._name = name
+        self._baseline = baseline
+        self._tolerance = tolerance
+        self._results = results
+
+    def __call__(self, setup: Callable[[], KeyHandler], keys: Sequence[Any]) -> BenchmarkResult:
+        """Measures a key stream twice, once for latency and once under tracemalloc for allocations
+
+        Args:
+            setup (Callable[[], KeyHandler]): Builds a fresh handler, called once per measurement so both passes
+                                              start from the same state
+            keys (Sequence[Any]): Keypresses fed to the handler one at a time
+
+        Returns:
+            BenchmarkResult: Latency percentiles in microseconds, the median memory allocated while handling a key
+                             and the memory still held after the whole stream, both in KiB
+        """
+        handle_key = setup()
+        latencies = []
+        for key in keys:
+            start = time.perf_counter_ns()
+            handle_key(key)
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+
+        handle_key = setup()
+        allocations = []
+        tracemalloc.start()
+        try:
+            retained_before, _ = tracemalloc.get_traced_memory()
+            for key in keys:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                handle_key(key)
+                _, peak = tracemalloc.get_traced_memory()
+                allocations.append((peak - before) / 1024)
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        result = BenchmarkResult(
+            name=self._name,
+            keypresses=len(keys),
+            median_us=statistics.median(latencies),
+            p95_us=latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            max_us=latencies[-1],
+            allocated_kib_per_key=statistics.median(allocations),
+            retained_kib=(retained - retained_before) / 1024,
+        )
+        self._results.append(result)
+
+        if self._baseline is not None and self._name in self._baseline:
+            allowed = self._baseline[self._name]['median_us'] * self._tolerance
+            if result.median_us > allowed:
+                pytest.fail(f'{self._name}: median {result.median_us:.1f}us per key exceeds {allowed:.1f}us')
+        return result
+
+
+_RESULTS_KEY = pytest.StashKey[List[BenchmarkResult]]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_RESULTS_KEY] = []
+
+
+@pytest.fixture(scope='session')
+def _bench_baseline(request: pytest.FixtureRequest) -> Optional[Dict[str, Any]]:
+    path = request.config.getoption('--bench-compare')
+    if path is None:
+        return None
+    with open(path) as baseline:
+        return {result['name']: result for result in json.load(baseline)}
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest, _bench_baseline: Optional[Dict[str, Any]]) -> KeyStreamBenchmark:
+    return KeyStreamBenchmark(
+        request.node.name, _bench_baseline, request.config.getoption('--bench-tolerance'), request.config.stash[_RESULTS_KEY]
+    )
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    results = config.stash.get(_RESULTS_KEY, [])
+    if not results:
+        return
+    terminalreporter.section('per-keypress latency and allocations')
+    terminalreporter.write_line(
+        f'{"benchmark":<60} {"keys":>6} {"median us":>10} {"p95 us":>10} {"max us":>10} {"KiB/key":>9} {"retained KiB":>12}'
+    )
+    for r in results:
+        terminalreporter.write_line(
+            f'{r.name:<60} {r.keypresses:>6} {r.median_us:>10.1f} {r.p95_us:>10.1f} {r.max_us:>10.1f}'
+            f' {r.allocated_kib_per_key:>9.2f} {r.retained_kib:>12.1f}'
+        )
+
+    path = config.getoption('--bench-save')
+    if path is not None:
+        with open(path, 'w') as saved:
+            json.dump([asdict(r) for r in results], saved, indent=2)
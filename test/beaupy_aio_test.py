@@ -0,0 +1,143 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+from yakh.key import Keys
+
+from beaupy import _beaupy, aio
+from beaupy._headless import HeadlessSession
+from beaupy.aio._aio import _split_keys, _TerminalKeyReader
+
+requires_pty = pytest.mark.skipif(sys.platform == "win32", reason="pseudo terminals are POSIX only")
+
+
+def test_split_keys_keeps_escape_sequences_together():
+    assert _split_keys("a\x1b[Bb\r") == ["a", "\x1b[B", "b", "\r"]
+
+
+def test_aio_elements_replay_scripted_keys():
+    async def flow():
+        picked = await aio.select(["test1", "test2"])
+        ticked = await aio.select_multiple(["a", "b"], return_indices=True)
+        name = await aio.prompt("Name?")
+        sure = await aio.confirm("Sure?")
+        return picked, ticked, name, sure
+
+    keys = [Keys.DOWN_ARROW, Keys.ENTER, " ", Keys.ENTER, "h", "i", Keys.ENTER, "y", Keys.ENTER]
+    with HeadlessSession(keys):
+        assert asyncio.run(flow()) == ("test2", [0], "hi", True)
+
+
+def test_aio_select_keeps_the_event_loop_running():
+    ticks = []
+
+    async def heartbeat():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def flow():
+        beat = asyncio.ensure_future(heartbeat())
+        try:
+            return await aio.select(["test1", "test2"])
+        finally:
+            beat.cancel()
+
+    def slow_keys():
+        yield Keys.DOWN_ARROW
+        while len(ticks) < 10:
+            pass
+        yield Keys.ENTER
+
+    with HeadlessSession(slow_keys()):
+        assert asyncio.run(flow()) == "test2"
+    assert len(ticks) >= 10
+
+
+def test_cancelled_aio_element_leaves_its_pending_read_to_the_next_one():
+    release = threading.Event()
+
+    def keys():
+        release.wait()
+        yield Keys.DOWN_ARROW
+        yield Keys.ENTER
+
+    async def flow():
+        first = asyncio.ensure_future(aio.select(["a", "b"]))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        second = asyncio.ensure_future(aio.select(["c", "d"]))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await second
+
+    with HeadlessSession(keys()) as session:
+        assert asyncio.run(flow()) == "d"
+    assert session.keys_read == 2
+
+
+@requires_pty
+def test_terminal_reader_reads_keys_through_the_event_loop():
+    master, slave = os.openpty()
+
+    async def read():
+        async with _TerminalKeyReader(slave) as reader:
+            os.write(master, "\x1b[Bé\r".encode())
+            first = await reader.read_key()
+            rest = await reader.read_keys()
+            return first, rest
+
+    try:
+        first, rest = asyncio.run(read())
+    finally:
+        os.close(master)
+        os.close(slave)
+    assert first == Keys.DOWN_ARROW
+    assert [str(key) for key in rest] == ["é", "\r"]
+
+
+@requires_pty
+def test_terminal_reader_leaves_unread_keys_for_the_next_element():
+    master, slave = os.openpty()
+
+    async def read():
+        os.write(master, b"x")
+        async with _TerminalKeyReader(slave) as reader:
+            typed_ahead = await asyncio.wait_for(reader.read_key(), 1)
+            os.write(master, b"\ry")
+            confirmed = await reader.read_keys()
+            await asyncio.sleep(0.05)
+        left = list(_beaupy._unread_keys)
+        async with _TerminalKeyReader(slave) as reader:
+            return typed_ahead, confirmed, left, await asyncio.wait_for(reader.read_key(), 1)
+
+    try:
+        typed_ahead, confirmed, left, next_key = asyncio.run(read())
+    finally:
+        _beaupy._unread_keys.clear()
+        os.close(master)
+        os.close(slave)
+    assert typed_ahead == "x"
+    assert [str(key) for key in confirmed] == ["\r"]
+    assert left == ["y"]
+    assert next_key == "y"
+
+
+def test_aio_select_accepts_async_iterable_options():
+    async def discovered_hosts():
+        for host in ["alpha", "beta"]:
+            yield host
+            await asyncio.sleep(0)
+
+    def keys():
+        time.sleep(0.05)
+        yield Keys.DOWN_ARROW
+        yield Keys.ENTER
+
+    with HeadlessSession(keys()):
+        assert asyncio.run(aio.select(discovered_hosts())) == "beta"
@@ -270,3 +270,16 @@ def test_confirm_raises_abort_on_esc(set_raise_on_escape):
     assert Live.update.call_args_list == [
         mock.call(renderable="Test (Y/N) \n[red]>[/red] Yes\n  No\n\n([bold]enter[/bold] to confirm)"),
     ]
+
+
+def test_confirm_handles_pasted_keys_at_once():
+    steps = iter(["y", "e", "s", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    with mock.patch("beaupy._beaupy._input_pending", side_effect=[True, True, True, False]):
+        res = confirm(question="Try test")
+
+    assert Live.update.call_args_list == [
+        mock.call(renderable="Try test (Y/N) \n  Yes\n[pink1]>[/pink1] No\n\n([bold]enter[/bold] to confirm)")
+    ]
+    assert res is True
@@ -0,0 +1,196 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+from yakh.key import Keys
+
+from beaupy import _beaupy as b
+from beaupy import _internals
+from beaupy._beaupy import Config, confirm, prompt, select, select_multiple
+from beaupy._headless import HeadlessSession
+from beaupy._internals import Abort, Column, OptionFeed
+
+
+def test_headless_session_replays_select():
+    with HeadlessSession([Keys.DOWN_ARROW, Keys.ENTER]) as session:
+        res = select(options=["test1", "test2"])
+    assert res == "test2"
+    assert session.keys_read == 2
+    assert session.frame_count == 2
+    assert session.frames[-1].renderable == "  test1\n[pink1]>[/pink1] test2\n\n([bold]enter[/bold] to confirm)"
+
+
+def test_headless_session_replays_a_whole_flow():
+    keys = ["h", "i", Keys.ENTER, "y", Keys.ENTER, " ", Keys.DOWN_ARROW, " ", Keys.ENTER]
+    with HeadlessSession(keys) as session:
+        name = prompt("Name?")
+        agreed = confirm("Sure?")
+        picked = select_multiple(["a", "b", "c"])
+    assert (name, agreed, picked) == ("hi", True, ["a", "b"])
+    assert session.keys_read == len(keys)
+    assert all(frame.at >= 0 and frame.duration >= 0 for frame in session.frames)
+    assert [frame.at for frame in session.frames] == sorted(frame.at for frame in session.frames)
+    assert session.elapsed >= session.frames[-1].at
+
+
+def test_headless_session_raises_when_keys_run_out():
+    with HeadlessSession([Keys.DOWN_ARROW]), pytest.raises(EOFError):
+        select(options=["test1", "test2"])
+
+
+def test_headless_session_restores_patched_globals():
+    get_key = b.get_key
+    update_rendered = _internals._update_rendered
+    had_console = "console" in vars(b)
+    with HeadlessSession([Keys.ENTER]):
+        select(options=["test1"])
+    assert b.get_key is get_key
+    assert _internals._update_rendered is update_rendered
+    assert ("console" in vars(b)) == had_console
+
+
+def test_render_stats_are_reported_per_element():
+    reported = []
+    with mock.patch.object(Config, "render_stats", reported.append), mock.patch.object(Config, "diff_rendering", True):
+        with HeadlessSession([Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.ENTER, "y", Keys.ENTER]):
+            select(options=["test1", "test2", "test3"])
+            confirm("Sure?")
+
+    assert [stats.element for stats in reported] == ["select", "confirm"]
+    select_stats = reported[0]
+    assert select_stats.frames == 3
+    assert len(select_stats.latencies) == 2
+    assert select_stats.render_time > 0
+    assert select_stats.write_time > 0
+    assert select_stats.bytes_written > 0
+    assert reported[1].frames == 2
+
+
+def test_render_stats_are_not_collected_by_default():
+    with HeadlessSession([Keys.ENTER]) as session:
+        select(options=["test1"])
+    assert not isinstance(session.console.file, _internals._CountingFile)
+
+
+def _wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_select_redraws_as_options_arrive_to_a_feed():
+    feed = OptionFeed(["test1"])
+
+    def keys():
+        yield Keys.DOWN_ARROW
+        frames = session.frame_count
+        threading.Thread(target=feed.extend, args=(["test2", "test3"],)).start()
+        _wait_for(lambda: session.frame_count > frames)
+        yield Keys.DOWN_ARROW
+        yield Keys.ENTER
+
+    with mock.patch.object(Config, "feed_refresh_interval", 0), HeadlessSession(keys()) as session:
+        res = select(options=feed)
+
+    assert res == "test2"
+    assert "test3" in session.frames[2].renderable
+    assert session.keys_read == 3
+
+
+def test_feed_redraws_wait_for_the_keypress_being_handled():
+    feed = OptionFeed()
+    painted_while_sorting = []
+
+    class Row:
+        def __init__(self, n):
+            self.n = n
+
+        def __lt__(self, other):
+            if not painted_while_sorting:
+                frames = session.frame_count
+                threading.Thread(target=feed.append, args=(Row(3),)).start()
+                time.sleep(0.05)
+                painted_while_sorting.append(session.frame_count - frames)
+            return self.n < other.n
+
+    feed.extend([Row(2), Row(1)])
+    columns = [Column("n", lambda row: row, formatter=lambda row: str(row.n))]
+    with mock.patch.object(Config, "feed_refresh_interval", 0), HeadlessSession([Keys.TAB, Keys.UP_ARROW, Keys.ENTER]) as session:
+        res = select(options=feed, columns=columns)
+
+    assert painted_while_sorting == [0]
+    assert res.n == 1
+
+
+def test_sorted_table_merges_rows_arriving_to_a_feed():
+    feed = OptionFeed(["b", "a"])
+
+    def keys():
+        yield Keys.TAB
+        frames = session.frame_count
+        feed.extend(["c", "aa"])
+        _wait_for(lambda: session.frame_count > frames)
+        yield Keys.END
+        yield Keys.ENTER
+
+    with mock.patch.object(Config, "feed_refresh_interval", 0), HeadlessSession(keys()) as session:
+        res = select(options=feed, columns=[Column("Name", lambda row: row)])
+
+    assert res == "c"
+    assert [line.split()[-1] for line in session.frames[-1].renderable.splitlines()[1:5]] == ["a", "aa", "b", "c"]
+
+
+def test_filtered_select_shows_matching_options_arriving_to_a_feed():
+    feed = OptionFeed(["b", "a"])
+
+    def keys():
+        yield "a"
+        frames = session.frame_count
+        feed.extend(["c", "aa"])
+        _wait_for(lambda: session.frame_count > frames)
+        yield Keys.DOWN_ARROW
+        yield Keys.ENTER
+
+    with mock.patch.object(Config, "feed_refresh_interval", 0), HeadlessSession(keys()) as session:
+        res = select(options=feed, filterable=True)
+
+    assert res == "aa"
+
+
+def test_select_multiple_waits_on_an_empty_feed():
+    feed = OptionFeed()
+
+    def keys():
+        yield " "
+        yield Keys.DOWN_ARROW
+        feed.extend(["a", "b"])
+        yield Keys.DOWN_ARROW
+        yield " "
+        yield Keys.ENTER
+
+    with HeadlessSession(keys()):
+        assert select_multiple(options=feed) == ["b"]
+
+
+def test_empty_feed_is_displayed_while_empty_list_is_not():
+    with HeadlessSession([Keys.ENTER, Keys.ESC]) as session:
+        assert select(options=[]) is None
+        assert select(options=OptionFeed()) is None
+    assert session.keys_read == 2
+
+
+@pytest.mark.parametrize(
+    "show",
+    [lambda: select(["a", "b"]), lambda: select_multiple(["a", "b"]), lambda: prompt("Name?"), lambda: confirm("Sure?")],
+)
+def test_headless_session_aborts_on_scripted_escape(show):
+    Config.raise_on_escape = True
+    try:
+        with HeadlessSession([Keys.ESC]), pytest.raises(Abort) as e:
+            show()
+    finally:
+        Config.raise_on_escape = False
+    assert e.value.key.key_codes == (27,)
+    assert str(e.value) == "Aborted by user with key (27,)"
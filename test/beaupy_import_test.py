@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import beaupy
+
+HEAVY_MODULES = ("emoji", "questo", "rich.console", "rich.live")
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+
+def _loaded_modules_after(statement):
+    return set(_run(f"import sys\n{statement}\nprint(' '.join(sys.modules))").split())
+
+
+def test_import_beaupy_does_not_load_heavy_dependencies():
+    loaded = _loaded_modules_after("import beaupy")
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_importing_elements_defers_emoji_and_console():
+    loaded = _loaded_modules_after("from beaupy import select, prompt, confirm, select_multiple")
+    assert "emoji" not in loaded
+    assert _run("import beaupy._beaupy as b\nprint('console' in vars(b))").strip() == "False"
+
+
+def test_lazy_attributes_resolve_to_implementations():
+    from beaupy import _beaupy, spinners
+
+    assert beaupy.select is _beaupy.select
+    assert beaupy.spinners is spinners
+    assert set(beaupy.__all__) <= set(dir(beaupy))
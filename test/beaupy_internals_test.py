@@ -1,8 +1,40 @@
+import io
+import time
+from unittest import mock
+
 import pytest
 from questo import prompt as qprompt
-from yakh.key import Key
+from rich.console import Console
+from yakh.key import Key, Keys
 
-from beaupy._internals import Abort, _render_prompt
+from beaupy._internals import (
+    Abort,
+    Column,
+    OptionFeed,
+    RenderStats,
+    _CompletionProvider,
+    _DiffLive,
+    _display_width,
+    _EditBuffer,
+    _FuzzyMatcher,
+    _GridLayout,
+    _handle_prompt_key,
+    _Keymap,
+    _PreprocessorCache,
+    _prompt_key_handler,
+    _PromptState,
+    _render_prompt,
+    _render_select,
+    _render_select_multiple,
+    _RenderScheduler,
+    _scroll_viewport,
+    _SelectState,
+    _StatsRecorder,
+    _Table,
+    _TreeView,
+    _TypeAhead,
+    _wrap_style,
+)
 
 
 def test_prompt_is_rendered_properly():
@@ -27,3 +59,411 @@ def test_abort_prints_non_printable_key_correctly():
     with pytest.raises(Abort) as excinfo:
         raise Abort(key)
     assert str(excinfo.value) == "Aborted by user with key (1, 2, 3)"
+
+
+def test_select_viewport_renders_only_visible_options():
+    state = _SelectState(options=[f"option{i}" for i in range(200_000)], index=150_000, viewport_size=3)
+    _scroll_viewport(state)
+    result = _render_select(lambda _, option: str(option), "pink1", ">", state)
+    assert state.viewport_offset == 149_998
+    assert result == "  option149998\n  option149999\n[pink1]>[/pink1] option150000\n\n([bold]enter[/bold] to confirm)"
+
+
+def test_select_viewport_scrolls_back_when_cursor_moves_above_it():
+    state = _SelectState(options=[f"option{i}" for i in range(10)], index=5, viewport_size=3, viewport_offset=5)
+    state.index = 2
+    _scroll_viewport(state)
+    assert state.viewport_offset == 2
+
+
+def test_select_multiple_viewport_ticks_absolute_indexes():
+    state = _SelectState(options=["a", "b", "c", "d"], index=3, selected_indexes={2: None}, viewport_size=2, viewport_offset=2)
+    result = _render_select_multiple(lambda _, option: str(option), "x", "pink1", "blue", state)
+    assert result.startswith("\\[[pink1]x[/pink1]] c\n\\[ ] [blue]d[/blue]\n")
+
+
+def test_preprocessor_cache_evicts_least_recently_used_options():
+    preprocessor = mock.MagicMock(side_effect=str.upper)
+    cache = _PreprocessorCache(preprocessor, maxsize=2)
+
+    assert cache(0, "a") == "A"
+    assert cache(1, "b") == "B"
+    assert cache(0, "a") == "A"
+    assert cache(2, "c") == "C"
+    assert cache(0, "a") == "A"
+    assert preprocessor.call_count == 3
+    assert cache(1, "b") == "B"
+    assert preprocessor.call_count == 4
+
+
+def test_fuzzy_matcher_narrows_previous_matches_and_reuses_them_for_shorter_queries():
+    preprocessor = mock.MagicMock(side_effect=lambda _, option: option)
+    matcher = _FuzzyMatcher(["us-west-1", "us-east-1", "eu-west-1", "[bold]US[/bold]-west-2"], preprocessor)
+
+    assert matcher.match("uw") == [0, 2, 3]
+    assert matcher.match("usw") == [0, 3]
+    assert matcher.match("u") == [0, 1, 2, 3]
+    assert matcher.match("Us-Ea") == [1]
+    assert preprocessor.call_count == 4
+
+
+def test_edit_buffer_edits_text_around_the_gap():
+    buffer = _EditBuffer("hello world")
+    buffer.insert(5, ",")
+    buffer.delete(0)
+    buffer.insert(0, "H")
+    buffer.delete(7, 6)
+    buffer.insert(7, "there")
+
+    assert str(buffer) == "Hello, there"
+    assert len(buffer) == 12
+
+
+def test_prompt_key_handler_does_not_modify_passed_state():
+    state = _PromptState(value="ab", cursor_position=1)
+    new_state = _prompt_key_handler(state, "x")
+
+    assert state.value == "ab"
+    assert state.cursor_position == 1
+    assert new_state.value == "axb"
+    assert new_state.cursor_position == 2
+
+
+def test_handle_prompt_key_edits_state_in_place():
+    state = _PromptState(value="ab", cursor_position=2)
+    _handle_prompt_key(state, Keys.BACKSPACE)
+    _handle_prompt_key(state, Keys.HOME)
+    _handle_prompt_key(state, Keys.DELETE)
+    _handle_prompt_key(state, "c")
+
+    assert state.value == "c"
+    assert state.cursor_position == 1
+
+
+def test_completion_provider_narrows_cached_prefix_results():
+    completion = mock.MagicMock(side_effect=lambda prefix: [word for word in ["help", "hello", "world"] if word.startswith(prefix)])
+    with _CompletionProvider(completion, debounce=0) as completions:
+        assert completions.get("he") == ["help", "hello"]
+        assert completions.get("hel") == ["help", "hello"]
+        assert completions.get("hell") == ["hello"]
+
+    assert completion.call_args_list == [mock.call("he")]
+
+
+def test_completion_provider_recomputes_when_results_do_not_share_the_prefix():
+    completion = mock.MagicMock(side_effect=lambda prefix: [f"{prefix}!", "other"])
+    with _CompletionProvider(completion, debounce=0) as completions:
+        assert completions.get("a") == ["a!", "other"]
+        assert completions.get("ab") == ["ab!", "other"]
+
+    assert completion.call_count == 2
+
+
+def test_completion_provider_computes_only_the_latest_debounced_request_in_background():
+    completion = mock.MagicMock(side_effect=lambda prefix: [prefix])
+    with _CompletionProvider(completion, debounce=0.05) as completions:
+        completions.request("a")
+        completions.request("ab")
+        completions.request("abc")
+        time.sleep(0.2)
+        assert completions.get("abc") == ["abc"]
+
+    assert completion.call_args_list == [mock.call("abc")]
+
+
+def test_render_scheduler_coalesces_frames_and_paints_the_last_one():
+    live = mock.MagicMock()
+    with _RenderScheduler(live, max_fps=1) as scheduler:
+        scheduler.submit("frame1")
+        scheduler.submit("frame2")
+        scheduler.submit("frame3")
+        assert live.update.call_args_list == [mock.call(renderable="frame1")]
+
+    assert live.update.call_args_list == [mock.call(renderable="frame1"), mock.call(renderable="frame3")]
+
+
+def test_render_scheduler_paints_held_back_frame_once_interval_passes():
+    live = mock.MagicMock()
+    with _RenderScheduler(live, max_fps=20) as scheduler:
+        scheduler.submit("frame1")
+        scheduler.submit("frame2")
+        time.sleep(0.2)
+        assert live.update.call_args_list == [mock.call(renderable="frame1"), mock.call(renderable="frame2")]
+        assert live.refresh.call_count == 2
+
+
+def test_render_scheduler_without_limit_paints_every_frame():
+    live = mock.MagicMock()
+    with _RenderScheduler(live) as scheduler:
+        scheduler.submit("frame1")
+        scheduler.submit("frame2")
+
+    assert live.update.call_count == 2
+
+
+def test_diff_live_rewrites_only_changed_lines():
+    output = io.StringIO()
+    live = _DiffLive("", console=Console(file=output, width=20, height=10, color_system=None, force_terminal=True))
+
+    live.update("a\nb\nc", refresh=True)
+    assert output.getvalue() == "\ra\x1b[K\n\rb\x1b[K\n\rc\x1b[K"
+
+    written = live.bytes_written
+    live.update("a\nX\nc", refresh=True)
+    assert output.getvalue()[written:] == "\x1b[1A\rX\x1b[K"
+
+    written = live.bytes_written
+    live.update("a", refresh=True)
+    assert output.getvalue()[written:] == "\r\x1b[J"
+
+    written = live.bytes_written
+    live.stop()
+    assert output.getvalue()[written:] == "\x1b[1A\r\x1b[J"
+
+
+def test_diff_live_keeps_last_frame_when_not_transient():
+    output = io.StringIO()
+    live = _DiffLive("", console=Console(file=output, width=20, height=10, color_system=None, force_terminal=True), transient=False)
+
+    live.update("a\nb", refresh=True)
+    live.update("a\nc", refresh=True)
+    live.stop()
+    assert output.getvalue() == "\ra\x1b[K\n\rb\x1b[K\rc\x1b[K\n"
+
+
+def test_wrap_style_combines_inner_styles_with_cursor_style():
+    result = _wrap_style("[red]a[/red] [link=https://example.com]b[/link]", "bold")
+    assert result == "[bold][bold red]a[/bold red] [link=https://example.com]b[/link][/bold]"
+
+
+def test_wrap_style_leaves_non_style_brackets_and_bare_closing_tags():
+    result = _wrap_style("[red]a[/] [not a style]", "bold")
+    assert result == "[bold][bold red]a[/] [not a style][/bold]"
+
+
+def test_wrap_style_is_memoized_per_option_and_style():
+    _wrap_style.cache_clear()
+    for _ in range(3):
+        _wrap_style("[green]option[/green]", "pink1")
+    assert _wrap_style.cache_info().hits == 2
+
+
+def test_display_width_counts_emojis_as_two_cells():
+    assert _display_width(">") == 1
+    assert _display_width("\U0001f449") == 2
+    assert _display_width("\u2705 ok") == 5
+    assert _display_width("東京") == 4
+
+
+def test_render_stats_latency_percentile_uses_nearest_rank():
+    stats = RenderStats("select", latencies=[0.4, 0.1, 0.3, 0.2])
+    assert stats.latency_percentile(50) == 0.2
+    assert stats.latency_percentile(95) == 0.4
+    assert stats.latency_percentile(0) == 0.1
+    assert RenderStats("select").latency_percentile(50) is None
+
+
+def test_stats_recorder_closes_latencies_of_all_keys_read_before_a_paint():
+    recorder = _StatsRecorder("prompt")
+    recorder.key_read(3)
+    recorder.painted(time.perf_counter(), time.perf_counter())
+    recorder.painted(time.perf_counter(), time.perf_counter())
+    assert recorder.stats.frames == 2
+    assert len(recorder.stats.latencies) == 3
+
+
+def test_fuzzy_matcher_includes_options_appended_to_a_feed():
+    feed = OptionFeed(["alpha", "beta"])
+    matcher = _FuzzyMatcher(feed, lambda _, option: option)
+    assert matcher.match("a") == [0, 1]
+    assert matcher.match("al") == [0]
+    feed.extend(["gamma", "palm"])
+    assert matcher.match("al") == [0, 3]
+
+
+def test_keymap_resolves_keys_by_text_and_by_key_codes():
+    keymap = _Keymap({"down": [Keys.DOWN_ARROW, "j"], "select": [" "], "select_all": ["a"], "confirm": [Keys.ENTER]})
+
+    assert keymap.actions(Key("", Keys.DOWN_ARROW, False)) == {"down"}
+    assert keymap.actions(Key("j", (106,), True)) == {"down"}
+    assert keymap.actions(Keys.ENTER) == {"confirm"}
+    assert keymap.actions(" ") == {"select"}
+    assert keymap.actions(Key("x", (120,), True)) == set()
+    assert keymap.actions("\r") == set()
+
+
+def test_keymap_reports_every_action_a_key_is_bound_to():
+    keymap = _Keymap({"select": [" "], "select_all": [(32,)], "confirm": [" "]})
+
+    assert keymap.actions(Key(" ", (32,), True)) == {"select", "select_all", "confirm"}
+
+
+def test_type_ahead_jumps_to_the_first_option_starting_with_the_typed_prefix():
+    preprocessor = mock.MagicMock(side_effect=lambda _, option: option)
+    type_ahead = _TypeAhead(["us-west-1", "eu-west-1", "US-East-1", "[bold]us-west-2[/bold]", "ap-south-1"], preprocessor, 1.0)
+
+    assert type_ahead.jump("u") == 2
+    assert type_ahead.jump("s") == 2
+    assert type_ahead.jump("-W") == 0
+    assert type_ahead.jump("x") is None
+    type_ahead.reset()
+    assert type_ahead.jump("A") == 4
+    assert preprocessor.call_count == 5
+
+
+def test_type_ahead_starts_a_new_prefix_after_the_timeout():
+    type_ahead = _TypeAhead(["alpha", "beta", "bravo"], lambda _, option: option, 1.0)
+
+    with mock.patch("beaupy._internals.time.monotonic", side_effect=[10.0, 10.5, 12.0]):
+        assert type_ahead.jump("b") == 1
+        assert type_ahead.jump("r") == 2
+        assert type_ahead.jump("a") == 0
+
+
+def test_type_ahead_indexes_options_appended_to_a_feed():
+    feed = OptionFeed(["delta", "alpha"])
+    type_ahead = _TypeAhead(feed, lambda _, option: option, 1.0)
+    assert type_ahead.jump("c") is None
+    feed.extend(["charlie", "bravo"])
+    type_ahead.reset()
+    assert type_ahead.jump("c") == 2
+
+
+def test_grid_layout_packs_options_into_columns_fitting_the_console():
+    console = Console(file=io.StringIO(), width=30)
+    preprocessor = mock.MagicMock(side_effect=lambda _, option: option)
+    options = ["a", "bb", "[bold]ccc[/bold]", "dd", "e", "ff", "g"]
+    layout = _GridLayout(options, preprocessor, console, ">")
+    state = _SelectState(options=options, index=4, viewport_size=2)
+
+    layout.arrange(state)
+    layout.arrange(state)
+    with mock.patch("beaupy._internals._plain_text") as plain_text:
+        result = _render_select(lambda _, option: str(option), "pink1", ">", state)
+
+    assert (state.columns, state.column_width) == (4, 5)
+    assert preprocessor.call_count == 7
+    assert list(state.option_widths) == [1, 2, 3, 2, 1, 2, 1]
+    plain_text.assert_not_called()
+    assert result == ("  a      bb     [bold]ccc[/bold]    dd\n" "[pink1]>[/pink1] e      ff     g\n\n([bold]enter[/bold] to confirm)")
+
+
+def test_grid_layout_is_recomputed_when_the_console_is_resized_or_a_wider_option_arrives():
+    console = Console(file=io.StringIO(), width=30)
+    feed = OptionFeed(["a", "bb"])
+    layout = _GridLayout(feed, lambda _, option: option, console, ">")
+    state = _SelectState(options=feed)
+
+    layout.arrange(state)
+    assert state.columns == 5
+    console.width = 12
+    layout.arrange(state)
+    assert state.columns == 2
+    feed.append("a much longer option")
+    layout.arrange(state)
+    assert state.columns == 1
+
+
+def test_grid_viewport_scrolls_by_whole_rows():
+    state = _SelectState(options=[str(i) for i in range(20)], index=13, viewport_size=2, columns=3)
+    _scroll_viewport(state)
+    assert state.viewport_offset == 9
+    state.index = 1
+    _scroll_viewport(state)
+    assert state.viewport_offset == 0
+
+
+def test_tree_view_splices_visible_descendants_on_expand_and_collapse():
+    tree = {"a": ["a1", "a2"], "a1": ["a11"], "b": []}
+    tree_view = _TreeView(["a", "b"], lambda node: tree.get(node, []), lambda node: node in tree)
+
+    def visible():
+        return [node.value for node in tree_view.visible]
+
+    tree_view.expand(0)
+    tree_view.expand(1)
+    assert visible() == ["a", "a1", "a11", "a2", "b"]
+    tree_view.collapse(0)
+    assert visible() == ["a", "b"]
+    tree_view.expand(0)
+    assert visible() == ["a", "a1", "a11", "a2", "b"]
+    assert tree_view.parent_position(2) == 1
+    assert tree_view.parent_position(3) == 0
+    assert tree_view.parent_position(4) is None
+    tree_view.expand(4)
+    assert tree_view.visible[4].has_children is False
+
+
+def test_table_formats_each_row_once_and_sorts_by_precomputed_keys():
+    value = mock.MagicMock(side_effect=lambda row: row[1])
+    formatter = mock.MagicMock(side_effect=lambda cpu: f"{cpu:.1f}")
+    rows = [("web", 12.5), ("db", 81.0), ("cache", 3.25)]
+    table = _Table(rows, [Column("Host", lambda row: row[0]), Column("CPU", value, formatter, align="right")], indent=2)
+
+    assert [table(i, row) for i, row in enumerate(rows)] == ["web      12.5", "db       81.0", "cache     3.2"]
+    assert table.order(None) is None
+    table.cycle_sort()
+    assert table.order(None) == [2, 1, 0]
+    table.cycle_sort()
+    assert table.order([0, 2]) == [0, 2]
+    table.cycle_sort()
+    assert table.order(None) == [2, 0, 1]
+    assert table.header() == "  [bold]Host    CPU ▲[/bold]"
+    table.cycle_sort()
+    table.cycle_sort()
+    assert table.sort_column is None
+    assert value.call_count == 3
+    assert formatter.call_count == 3
+
+
+def test_table_sorts_values_of_different_types_without_a_sort_key():
+    rows = [3, None, "b", 1.5, None, "a", 10]
+    table = _Table(rows, [Column("Value", lambda row: row)], indent=0)
+
+    table.cycle_sort()
+    assert table.order(None) == [3, 0, 6, 5, 2, 1, 4]
+    table.cycle_sort()
+    assert table.order(None) == [2, 5, 6, 0, 3, 1, 4]
+    assert table.order([0, 1, 3]) == [0, 3, 1]
+
+
+def test_table_merges_arriving_rows_into_the_sorted_order():
+    feed = OptionFeed([3, None, 1])
+    table = _Table(feed, [Column("Value", lambda row: row)], indent=0)
+
+    table.cycle_sort()
+    table.cycle_sort()
+    order = table.order(None)
+    assert order == [0, 2, 1]
+    feed.extend([2, None, 3, 0])
+    assert table.order(None) is order
+    assert order == [0, 5, 3, 2, 6, 1, 4]
+    feed.append("a")
+    assert table.order(None) == [7, 0, 5, 3, 2, 6, 1, 4]
+
+
+def test_table_keeps_the_order_of_rows_whose_keys_cannot_be_compared():
+    rows = [{"b": 1}, None, {"a": 2}]
+    table = _Table(rows, [Column("Value", lambda row: row)], indent=0)
+
+    table.cycle_sort()
+    assert table.order(None) == [0, 2, 1]
+    table.cycle_sort()
+    assert table.order(None) == [0, 2, 1]
+
+
+def test_table_aligns_columns_after_wide_characters():
+    rows = [("東京", 1), ("Paris", 2)]
+    table = _Table(rows, [Column("City", lambda row: row[0]), Column("N", lambda row: row[1])], indent=0)
+
+    assert [table(i, row) for i, row in enumerate(rows)] == ["東京    1", "Paris   2"]
+
+
+def test_table_widens_columns_as_rows_arrive():
+    feed = OptionFeed(["a"])
+    table = _Table(feed, [Column("Name", lambda row: row), Column("Length", len)], indent=0)
+
+    assert table(0, "a") == "a       1"
+    feed.append("a much longer name")
+    assert table(0, "a") == "a                   1"
+    assert table.widths == [18, 8]
@@ -4,7 +4,7 @@ import pytest
 from yakh.key import Key, Keys
 
 from beaupy import _beaupy as b
-from beaupy._beaupy import Config, Live, prompt
+from beaupy._beaupy import Config, Live, confirm, prompt
 from beaupy._internals import Abort, ConversionError, ValidationError
 
 
@@ -345,3 +345,64 @@ def test_verify_that_completion_renders_properly():
     ]
 
     assert res == "Hello"
+
+
+def test_completion_is_computed_for_typed_value_and_kept_while_cycling():
+    steps = iter(["h", "e", Keys.TAB, Keys.TAB, Keys.TAB, Keys.ENTER])
+    completion = mock.MagicMock(side_effect=lambda prefix: [word for word in ["help", "hello", "world"] if word.startswith(prefix)])
+
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = prompt(prompt="Try test", completion=completion)
+
+    assert res == "help"
+    assert mock.call("he") in completion.call_args_list
+    assert all(call in [mock.call("h"), mock.call("he")] for call in completion.call_args_list)
+
+
+def test_pasted_text_is_rendered_once():
+    steps = [Key(char, (ord(char),), is_printable=True) for char in "pasted"] + [Keys.ENTER]
+    keys = iter(steps)
+
+    b.get_key = lambda: next(keys)
+    Live.update = mock.MagicMock()
+    with mock.patch("beaupy._beaupy._input_pending", side_effect=[True] * 5 + [False] + [False]):
+        res = prompt("")
+
+    assert Live.update.call_args_list == [
+        mock.call(renderable="\n> [black on white] [/black on white]\n\n([bold]enter[/bold] to confirm)"),
+        mock.call(renderable="\n> pasted[black on white] [/black on white]\n\n([bold]enter[/bold] to confirm)"),
+    ]
+    assert res == "pasted"
+
+
+def test_bracketed_paste_inserts_control_keys_as_text():
+    steps = iter(
+        [
+            Key("\x1b[200~", (27, 91, 50, 48, 48, 126), is_printable=False),
+            Key("a", (97,), is_printable=True),
+            Key("\r", (13,), is_printable=True),
+            Key("b", (98,), is_printable=True),
+            Key("\x1b[201~", (27, 91, 50, 48, 49, 126), is_printable=False),
+            Keys.ENTER,
+        ]
+    )
+
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = prompt("")
+
+    assert Live.update.call_count == 2
+    assert res == "ab"
+
+
+def test_keys_typed_after_enter_are_left_for_the_next_element():
+    enter = Key("\r", (13,), is_printable=True)
+    typed = [Key("a", (97,), is_printable=True), Key("b", (98,), is_printable=True), enter, Key("y", (121,), is_printable=True), enter]
+
+    b.get_key = lambda: typed.pop(0)
+    Live.update = mock.MagicMock()
+    with mock.patch("beaupy._beaupy._input_pending", side_effect=lambda: bool(typed)):
+        assert prompt("") == "ab"
+        assert typed == [Key("y", (121,), is_printable=True), enter]
+        assert confirm("Sure?") is True
@@ -5,7 +5,7 @@ from yakh.key import Key, Keys
 
 from beaupy import _beaupy as b
 from beaupy._beaupy import Config, Live, select_multiple, warnings
-from beaupy._internals import Abort
+from beaupy._internals import Abort, Column
 
 
 def raise_keyboard_interrupt():
@@ -730,3 +730,61 @@ def test_select_multiple_ticks_correct_option():
     ]
     assert Live.update.call_count == 1
     assert res == ["test6"]
+
+
+def test_select_multiple_with_generator_ticks_all_options_including_unloaded_ones():
+    steps = iter(["a", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_multiple(options=(f"test{i}" for i in range(1000)), return_indices=True)
+
+    assert res == list(range(1000))
+
+
+def test_select_multiple_with_generator_returns_pre_ticked_options_not_loaded_yet():
+    steps = iter([Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_multiple(options=(f"test{i}" for i in range(1000)), ticked_indices=[900])
+
+    assert res == ["test900"]
+
+
+def test_select_multiple_returns_options_in_order_of_ticking():
+    steps = iter([Keys.END, " ", Keys.HOME, " ", Keys.DOWN_ARROW, " ", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_multiple(options=["test1", "test2", "test3"], ticked_indices=[1])
+
+    assert res == ["test3", "test1"]
+
+
+def test_select_multiple_does_not_modify_passed_ticked_indices():
+    steps = iter([" ", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    ticked_indices = [1]
+    res = select_multiple(options=["test1", "test2"], ticked_indices=ticked_indices, return_indices=True)
+
+    assert res == [1, 0]
+    assert ticked_indices == [1]
+
+
+def test_select_multiple_type_ahead_keeps_bound_keys():
+    steps = iter(["e", " ", "u", "s", "-", "w", " ", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_multiple(options=["ap-south-1", "eu-west-1", "us-east-1", "us-west-1"], type_ahead=True)
+
+    assert res == ["eu-west-1", "us-west-1"]
+
+
+def test_select_multiple_table_ticks_rows_not_positions():
+    rows = [("web", 12.5), ("db", 81.0), ("cache", 3.25)]
+    steps = iter([Keys.TAB, " ", Keys.TAB, Keys.DOWN_ARROW, " ", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_multiple(options=rows, columns=[Column("Host", lambda row: row[0])], return_indices=True)
+
+    # Ticked on the third position, then on the second, which by then hold the first and second rows
+    assert res == [0, 1]
@@ -1,11 +1,15 @@
+import io
+import itertools
+import time
 from unittest import mock
 
 import pytest
+from rich.console import Console
 from yakh.key import Key, Keys
 
 from beaupy import _beaupy as b
 from beaupy._beaupy import Config, Live, select, warnings
-from beaupy._internals import Abort
+from beaupy._internals import Abort, Column
 
 
 def raise_keyboard_interrupt():
@@ -545,3 +549,213 @@ def test_select_paginates_to_last_page_when_on_first_page_and_end_is_pressed():
     ]
     assert Live.update.call_count == 2
     assert res == "test5"
+
+
+def test_select_calls_preprocessor_once_per_option():
+    steps = iter([Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.UP_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    preprocessor = mock.MagicMock(side_effect=lambda val: val.upper())
+    res = select(options=["test1", "test2", "test3"], preprocessor=preprocessor)
+
+    assert Live.update.call_args_list[-1] == mock.call(
+        renderable="  TEST1\n[pink1]>[/pink1] TEST2\n  TEST3\n\n([bold]enter[/bold] to confirm)"
+    )
+    assert preprocessor.call_count == 3
+    assert res == "test2"
+
+
+def test_select_calls_preprocessor_on_every_redraw_when_caching_is_disabled():
+    steps = iter([Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    preprocessor = mock.MagicMock(side_effect=lambda val: val.upper())
+    select(options=["test1", "test2", "test3"], preprocessor=preprocessor, cache_preprocessed=False)
+
+    assert preprocessor.call_count == 6
+
+
+def test_select_reads_options_from_an_endless_generator_lazily():
+    steps = iter([Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=(f"test{i}" for i in itertools.count()), pagination=True, page_size=2)
+
+    assert Live.update.call_args_list == [
+        mock.call(renderable="[pink1]>[/pink1] test0\n  test1[grey58]\n\nPage 1/50[/grey58]\n\n([bold]enter[/bold] to confirm)"),
+        mock.call(renderable="  test0\n[pink1]>[/pink1] test1[grey58]\n\nPage 1/50[/grey58]\n\n([bold]enter[/bold] to confirm)"),
+        mock.call(renderable="[pink1]>[/pink1] test2\n  test3[grey58]\n\nPage 2/50[/grey58]\n\n([bold]enter[/bold] to confirm)"),
+    ]
+    assert res == "test2"
+
+
+def test_select_with_generator_loads_remaining_options_when_end_is_pressed():
+    steps = iter([Keys.END, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=(f"test{i}" for i in range(1000)), return_index=True)
+
+    assert res == 999
+
+
+def test_select_fetches_only_visible_chunks_from_sequence_like_providers():
+    class Provider:
+        def __init__(self):
+            self.fetched = []
+
+        def __len__(self):
+            return 1_000_000
+
+        def __getitem__(self, index):
+            self.fetched.append(index)
+            return f"test{index}"
+
+    provider = Provider()
+    steps = iter([Keys.END, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=provider)
+
+    assert res == "test999999"
+    assert len(provider.fetched) <= 2 * Config.options_chunk_size
+
+
+def test_select_filters_options_by_typed_characters():
+    steps = iter(["t", "3", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=["test1", "test2", "test3", "tost3"], filterable=True)
+
+    assert Live.update.call_args_list == [
+        mock.call(renderable="[pink1]>[/pink1] test1\n  test2\n  test3\n  tost3\n\n([bold]enter[/bold] to confirm)"),
+        mock.call(
+            renderable="[pink1]>[/pink1] [underline]t[/underline]est1\n  [underline]t[/underline]est2\n  [underline]t[/underline]est3\n"
+            "  [underline]t[/underline]ost3\n[grey58]Filter: t[/grey58]\n\n([bold]enter[/bold] to confirm)"
+        ),
+        mock.call(
+            renderable="[pink1]>[/pink1] [underline]t[/underline]est[underline]3[/underline]\n  [underline]t[/underline]ost[underline]3[/underline]"
+            "\n[grey58]Filter: t3[/grey58]\n\n([bold]enter[/bold] to confirm)"
+        ),
+    ]
+    assert res == "test3"
+
+
+def test_select_filter_returns_index_in_original_options():
+    steps = iter(["o", "x", Keys.BACKSPACE, Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=["test1", "tost2", "test3", "tost4"], filterable=True, return_index=True)
+
+    assert res == 3
+
+
+def test_select_filter_ignores_confirm_when_nothing_matches():
+    steps = iter(["x", Keys.ENTER, Keys.DOWN_ARROW, Keys.BACKSPACE, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=["test1", "test2"], filterable=True)
+
+    assert res == "test1"
+
+
+def test_select_coalesces_frames_when_max_fps_is_set():
+    steps = iter([Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    with mock.patch.object(Config, "max_fps", 1):
+        res = select(options=["test1", "test2", "test3", "test4"])
+
+    assert Live.update.call_args_list == [
+        mock.call(renderable="[pink1]>[/pink1] test1\n  test2\n  test3\n  test4\n\n([bold]enter[/bold] to confirm)"),
+        mock.call(renderable="  test1\n  test2\n  test3\n[pink1]>[/pink1] test4\n\n([bold]enter[/bold] to confirm)"),
+    ]
+    assert res == "test4"
+
+
+def test_select_drops_held_back_frame_when_aborted():
+    steps = iter([Keys.DOWN_ARROW, Keys.DOWN_ARROW, Key("esc", (27,), is_printable=False)])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    with mock.patch.object(Config, "max_fps", 20), mock.patch.object(Config, "raise_on_escape", True), pytest.raises(Abort):
+        select(options=["test1", "test2", "test3"])
+    time.sleep(0.1)
+
+    assert Live.update.call_args_list == [
+        mock.call(renderable="[pink1]>[/pink1] test1\n  test2\n  test3\n\n([bold]enter[/bold] to confirm)"),
+    ]
+
+
+def test_select_with_diff_rendering_writes_only_lines_under_moved_cursor():
+    output = io.StringIO()
+    steps = iter([Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    with mock.patch.object(Config, "diff_rendering", True), mock.patch.object(
+        b, "console", Console(file=output, width=40, height=20, color_system=None, force_terminal=True)
+    ):
+        res = select(options=["test1", "test2", "test3"])
+
+    frames = output.getvalue()
+    assert "\r> test1\x1b[K\n\r  test2\x1b[K\n\r  test3\x1b[K" in frames
+    assert "\x1b[4A\r  test1\x1b[K\n\r> test2\x1b[K" in frames
+    assert "test3" not in frames[frames.index("\x1b[4A") :]
+    assert res == "test2"
+
+
+def test_select_follows_rebound_default_keys():
+    steps = iter(["j", "j", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    with mock.patch.object(b.DefaultKeys, "down", [*b.DefaultKeys.down, "j"]):
+        res = select(options=["test1", "test2", "test3"])
+
+    assert res == "test3"
+
+
+def test_select_type_ahead_jumps_to_the_typed_prefix():
+    options = ["ap-south-1", "eu-west-1", "us-east-1", "us-west-1", "us-west-2"]
+    steps = iter(["u", "s", "-", "w", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=options, type_ahead=True)
+
+    assert res == "us-west-1"
+
+
+def test_select_type_ahead_prefix_is_reset_by_navigation():
+    steps = iter(["u", Keys.DOWN_ARROW, "e", Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=["ap-south-1", "eu-west-1", "us-east-1", "us-west-1"], type_ahead=True)
+
+    assert res == "eu-west-1"
+
+
+def test_select_grid_moves_the_cursor_in_two_dimensions():
+    # Four options of width 1 plus a cursor fit three to a row in a console 14 characters wide
+    steps = iter([Keys.DOWN_ARROW, Keys.RIGHT_ARROW, Keys.DOWN_ARROW, Keys.UP_ARROW, Keys.UP_ARROW, Keys.LEFT_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    with mock.patch.object(b, "console", Console(file=io.StringIO(), width=14, height=10)):
+        res = select(options=["a", "b", "c", "d", "e", "f", "g"], grid=True, return_index=True)
+
+    # d -> e -> b (wrapped to the top of the column) -> e (wrapped to the bottom) -> b -> a
+    assert res == 0
+
+
+def test_select_grid_cannot_be_paginated():
+    with pytest.raises(ValueError, match="`grid` and `pagination` cannot be combined"):
+        select(options=["a", "b"], grid=True, pagination=True)
+
+
+def test_select_table_sorts_rows_and_keeps_the_cursor_on_its_row():
+    rows = [("web", 12.5), ("db", 81.0), ("cache", 3.25)]
+    columns = [Column("Host", lambda row: row[0]), Column("CPU", lambda row: row[1], align="right")]
+    steps = iter([Keys.DOWN_ARROW, Keys.TAB, Keys.UP_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select(options=rows, columns=columns)
+
+    assert Live.update.call_args_list[2] == mock.call(
+        renderable="  [bold]Host ▲  CPU[/bold]\n  cache    3.25\n[pink1]>[/pink1] db       81.0\n  web      12.5\n\n([bold]enter[/bold] to confirm)"
+    )
+    assert res == ("cache", 3.25)
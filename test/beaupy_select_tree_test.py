@@ -0,0 +1,88 @@
+from unittest import mock
+
+import pytest
+from yakh.key import Key, Keys
+
+from beaupy import _beaupy as b
+from beaupy._beaupy import Config, Live, select_tree
+from beaupy._internals import Abort
+
+TREE = {
+    "etc": ["nginx", "ssh"],
+    "nginx": ["nginx.conf", "sites"],
+    "sites": ["default"],
+    "ssh": ["sshd_config"],
+    "usr": ["bin", "lib"],
+}
+
+
+def children(node):
+    return TREE.get(node, [])
+
+
+def test_select_tree_with_no_roots_permissive():
+    b.get_key = lambda: Keys.ENTER
+    assert select_tree([], children) is None
+
+
+def test_select_tree_with_no_roots_strict():
+    b.get_key = lambda: Keys.ENTER
+    with pytest.raises(ValueError, match="`roots` cannot be empty"):
+        select_tree([], children, strict=True)
+
+
+def test_select_tree_expands_nodes_and_returns_the_selected_one():
+    steps = iter([Keys.RIGHT_ARROW, Keys.RIGHT_ARROW, Keys.RIGHT_ARROW, Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_tree(["etc", "usr"], children)
+
+    assert res == "sites"
+    assert Live.update.call_args_list[-1] == mock.call(
+        renderable="  ▾ etc\n    ▾ nginx\n      ▸ nginx.conf\n[pink1]>[/pink1]     ▸ sites\n    ▸ ssh\n  ▸ usr"
+        "\n\n([bold]→[/bold]/[bold]←[/bold] to expand/collapse, [bold]enter[/bold] to confirm)"
+    )
+
+
+def test_select_tree_loads_children_only_when_a_node_is_expanded_for_the_first_time():
+    loader = mock.MagicMock(side_effect=children)
+    steps = iter([Keys.RIGHT_ARROW, Keys.LEFT_ARROW, " ", Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_tree(["etc", "usr"], loader)
+
+    assert res == "nginx"
+    assert loader.call_args_list == [mock.call("etc")]
+
+
+def test_select_tree_left_arrow_moves_to_the_parent_and_collapses_it():
+    steps = iter([Keys.RIGHT_ARROW, Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.LEFT_ARROW, Keys.LEFT_ARROW, Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_tree(["etc", "usr"], children)
+
+    assert res == "usr"
+
+
+def test_select_tree_returns_the_path_to_the_selected_node():
+    steps = iter([Keys.RIGHT_ARROW, Keys.DOWN_ARROW, Keys.DOWN_ARROW, Keys.RIGHT_ARROW, Keys.DOWN_ARROW, Keys.ENTER])
+    b.get_key = lambda: next(steps)
+    Live.update = mock.MagicMock()
+    res = select_tree(["etc", "usr"], children, return_path=True)
+
+    assert res == ["etc", "ssh", "sshd_config"]
+
+
+@pytest.fixture
+def set_raise_on_escape():
+    Config.raise_on_escape = True
+    yield
+    Config.raise_on_escape = False
+
+
+def test_select_tree_raises_abort_when_esc_is_pressed_and_raise_on_escape_is_true(set_raise_on_escape):
+    b.get_key = lambda: Key("esc", (27,), is_printable=False)
+    Live.update = mock.MagicMock()
+    with pytest.raises(Abort) as e:
+        select_tree(["etc"], children)
+    assert str(e.value) == "Aborted by user with key (27,)"
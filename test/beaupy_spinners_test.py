@@ -1,4 +1,4 @@
-from typing import Callable
+from unittest import mock
 from unittest.mock import MagicMock
 
 import pytest
@@ -7,49 +7,117 @@ from beaupy.spinners import _spinners
 
 
 def test_spinner_gets_created_as_expected():
-    _spinners.Live = MagicMock()
-    _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
+    spinner = _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
 
-    _spinners.Live.assert_called_once()
-
-    assert _spinners.Live.call_args[0] == ("",)
-    assert _spinners.Live.call_args[1]["transient"] is False
-    assert _spinners.Live.call_args[1]["refresh_per_second"] == 10
-
-    assert isinstance(_spinners.Live.call_args[1]["get_renderable"], Callable)
+    assert [frame.plain for frame in spinner._frames] == ["t test", "e test", "s test", "t test"]
+    assert spinner._refresh_per_second == 10
+    assert spinner._transient is False
 
 
 def test_spinner_creation_fails_if_spinner_characters_are_an_empty_list():
-    _spinners.Live = MagicMock()
     with pytest.raises(ValueError, match="`spinner_characters` can't be empty"):
         _spinners.Spinner([], "test", 10, False)
 
 
-def test_spinner_callable_behaves_as_expected():
-    _spinners.Live = MagicMock()
-    _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
+def test_spinner_frames_follow_elapsed_time():
+    spinner = _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
+
+    frames = [spinner._frame_at(spinner._started + tick / 10 + 0.05).plain for tick in range(5)]
+
+    assert frames == ["t test", "e test", "s test", "t test", "t test"]
+
+
+def test_spinner_start_and_stop_register_with_the_shared_ticker():
+    spinner = _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
+    with mock.patch.object(_spinners, "_ticker") as ticker:
+        spinner.start()
+        ticker.add.assert_called_once_with(spinner)
+        spinner.stop()
+        ticker.remove.assert_called_once_with(spinner)
+
+
+def test_running_spinners_share_one_live_display():
+    first = _spinners.Spinner(["a"], "first", 10, True)
+    second = _spinners.Spinner(["b"], "second", 20, True)
+    ticker = _spinners._SpinnerTicker()
+
+    with mock.patch.object(_spinners, "Live", MagicMock()) as live:
+        ticker.add(first)
+        ticker.add(second)
+
+        live.assert_called_once()
+        assert live.call_args[1]["auto_refresh"] is False
+        rendered = live.call_args[1]["get_renderable"]()
+        assert [line.plain for line in rendered.renderables] == ["a first", "b second"]
+        assert ticker._interval() == 1 / 20
+
+        ticker.remove(first)
+        live.return_value.stop.assert_not_called()
+        ticker.remove(second)
+        live.return_value.stop.assert_called_once()
+    assert ticker._thread is None
+
+
+def test_stopping_a_persistent_spinner_prints_its_last_frame():
+    spinner = _spinners.Spinner(["a"], "done", 10, False)
+    ticker = _spinners._SpinnerTicker()
+
+    with mock.patch.object(_spinners, "Live", MagicMock()) as live:
+        ticker.add(spinner)
+        ticker.remove(spinner)
+
+    printed = live.return_value.console.print.call_args[0][0]
+    assert printed.plain == "a done"
+
+
+def test_spinner_group_draws_every_task_in_one_frame():
+    group = _spinners.SpinnerGroup(["a", "b"], 10, True, "+", "x")
+    first = group.add("first")
+    second = group.add("second")
+    third = group.add("third")
+
+    first.update("[bold]first[/bold], step 2")
+    second.done()
+    third.fail("third broke")
+
+    frame = group._frame_at(group._started + 0.15)
+    assert frame.plain == "b first, step 2\n+ second\nx third broke"
+    assert [task.status for task in group.tasks] == ["running", "done", "failed"]
+
+
+def test_spinner_group_reparses_text_only_when_it_changes():
+    group = _spinners.SpinnerGroup(["a"])
+    task = group.add("[red]working[/red]")
+
+    with mock.patch.object(_spinners.Text, "from_markup", wraps=_spinners.Text.from_markup) as from_markup:
+        group._frame_at(group._started)
+        group._frame_at(group._started + 1)
+        task.update("still working")
+        group._frame_at(group._started + 2)
 
-    _spinners.Live.assert_called_once()
+    assert from_markup.call_count == 2
 
-    get_renderable = _spinners.Live.call_args[1]["get_renderable"]
 
-    assert get_renderable() == "t test"
-    assert get_renderable() == "e test"
-    assert get_renderable() == "s test"
-    assert get_renderable() == "t test"
+def test_spinner_group_accepts_updates_from_many_threads():
+    from concurrent.futures import ThreadPoolExecutor
 
+    group = _spinners.SpinnerGroup(["a"])
 
-def test_spinner_start_methods_starts_a_live_display():
-    _spinners.Live = MagicMock()
-    result = _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
-    result.start()
+    def work(index):
+        task = group.add(f"task {index}")
+        task.update(f"task {index} halfway")
+        task.done()
 
-    result._live_display.start.assert_called_once()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(200)))
 
+    assert len(group.tasks) == 200
+    assert all(task.status == "done" for task in group.tasks)
+    assert len(group._frame_at(group._started).plain.splitlines()) == 200
 
-def test_spinner_stop_methods_stops_a_live_display():
-    result = _spinners.Spinner(["t", "e", "s", "t"], "test", 10, False)
-    result._live_display = MagicMock()
-    result.stop()
 
-    result._live_display.stop.assert_called_once()
+def test_spinner_group_context_manager_registers_with_the_shared_ticker():
+    with mock.patch.object(_spinners, "_ticker") as ticker:
+        with _spinners.SpinnerGroup(["a"]) as group:
+            ticker.add.assert_called_once_with(group)
+        ticker.remove.assert_called_once_with(group)